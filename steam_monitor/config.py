@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from typing import Optional
 import argparse
 
+_PARSER: Optional[argparse.ArgumentParser] = None
+
 
 @dataclass(frozen=True)
 class Config:
@@ -14,23 +16,37 @@ class Config:
     @classmethod
     def from_cli(cls) -> "Config":
         """Parses config from CLI with defaults."""
+        args = _get_parser().parse_args()
+        return cls(
+            interval=args.interval,
+            samples=args.samples if not args.daemon else 0,
+            log_file=args.log_file,
+            daemon=args.daemon,
+            steam_path=args.steam_path,
+        )
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """Builds the CLI argument parser on first use and reuses it afterwards."""
+    global _PARSER
+    if _PARSER is None:
         parser = argparse.ArgumentParser(description="Steam Download Monitor")
         parser.add_argument(
             "--interval",
             type=int,
-            default=cls.interval,
+            default=Config.interval,
             help="Interval in seconds between samples (default: 60)",
         )
         parser.add_argument(
             "--samples",
             type=int,
-            default=cls.samples,
+            default=Config.samples,
             help="Number of samples to take (default: 5; 0 for infinite in daemon mode)",
         )
         parser.add_argument(
             "--log-file",
             type=str,
-            default=cls.log_file,
+            default=Config.log_file,
             help="Log file path (default: stdout)",
         )
         parser.add_argument(
@@ -41,14 +57,8 @@ class Config:
         parser.add_argument(
             "--steam-path",
             type=str,
-            default=cls.steam_path,
+            default=Config.steam_path,
             help="Custom Steam installation path (overrides auto-detection)",
         )
-        args = parser.parse_args()
-        return cls(
-            interval=args.interval,
-            samples=args.samples if not args.daemon else 0,
-            log_file=args.log_file,
-            daemon=args.daemon,
-            steam_path=args.steam_path,
-        )
+        _PARSER = parser
+    return _PARSER
@@ -1,14 +1,23 @@
-import platform
+import os
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 from .models import SteamInstall
 from .errors import SteamNotFoundError
 
+if sys.platform == "win32":
+    import winreg
+else:
+    winreg = None
+
+# sys.platform values of the supported systems, and their names in messages.
+_PLATFORM_NAMES = {"win32": "Windows", "linux": "Linux", "darwin": "Darwin"}
+
 
 def _find_windows_steam() -> Optional[SteamInstall]:
+    if winreg is None:
+        return None
     try:
-        import winreg
-
         with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam") as key:
             path, _ = winreg.QueryValueEx(key, "SteamPath")
         root = Path(path)
@@ -17,7 +26,7 @@ def _find_windows_steam() -> Optional[SteamInstall]:
         if steamapps.exists() and logs.exists():
             return SteamInstall(root=root, steamapps=steamapps, logs=logs)
         return None
-    except (OSError, ImportError):
+    except OSError:
         return None
 
 
@@ -43,7 +52,9 @@ def _find_macos_steam() -> Optional[SteamInstall]:
 
 
 class SteamFinder:
-    def find(self, custom_path: Optional[str] = None) -> SteamInstall:
+    def find(
+        self, custom_path: Optional[Union[str, "os.PathLike[str]"]] = None
+    ) -> SteamInstall:
         if custom_path:
             root = Path(custom_path).resolve()
             steamapps = root / "steamapps"
@@ -55,7 +66,7 @@ class SteamFinder:
                     f"Custom Steam path {custom_path} is invalid: missing steamapps or logs directory"
                 )
 
-        system = platform.system()
+        system = _PLATFORM_NAMES.get(sys.platform, sys.platform)
         if system == "Windows":
             steam = _find_windows_steam()
         elif system == "Linux":
@@ -1,8 +1,9 @@
-from typing import Optional, List, Tuple
+import os
+from typing import Iterator, Optional, List, Tuple
 from pathlib import Path
 
 from .errors import ACFParseError
-from .models import DownloadingGame
+from .models import DOWNLOADING_FLAGS, PAUSED_FLAGS, DownloadingGame, LogSnapshot
 from .parser import LogParser
 import logging
 
@@ -14,13 +15,47 @@ class GameFinder:
         self.steamapps = steamapps
         self.log_parser = log_parser
 
-    def find_active_game(self) -> Optional[DownloadingGame]:
-        """Finds the active game using logs or fallback."""
+    def _iter_manifests(self) -> Iterator[os.DirEntry]:
+        """Yields appmanifest_*.acf entries from one directory scan.
+
+        Names are filtered without any per-file syscall. ``DirEntry.stat()``
+        still stats the file on POSIX (Windows fills it from the scan), and
+        only once per entry.
+        """
+        try:
+            with os.scandir(self.steamapps) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("appmanifest_") and name.endswith(".acf"):
+                        yield entry
+        except OSError as e:
+            logging.warning(f"Failed to scan {self.steamapps}: {e}")
+
+    def find_active_game(
+        self, snapshot: Optional[LogSnapshot] = None
+    ) -> Optional[DownloadingGame]:
+        """Finds the active game using logs or fallback.
+
+        Pass a ``LogParser.snapshot()`` to answer from it instead of the live log.
+        """
         # Get most recent active download directly from log parser
-        active_app_id = self.log_parser.get_most_recent_active_download()
+        active_app_id = self.log_parser.get_most_recent_active_download(snapshot)
 
         if active_app_id:
-            for acf_path in self.steamapps.glob("appmanifest_*.acf"):
+            # Steam names manifests after the app id, so try that path first.
+            acf_str = os.path.join(self.steamapps, f"appmanifest_{active_app_id}.acf")
+            if os.path.isfile(acf_str):
+                acf_path = Path(acf_str)
+                try:
+                    data = self.log_parser.parse_acf(acf_path)
+                    name = data.get("name", "Unknown")
+                    return DownloadingGame(active_app_id, name, acf_path)
+                except ACFParseError as e:
+                    logging.warning(f"Skipping ACF due to parse error: {e}")
+                    return self._find_active_game_fallback(snapshot)
+
+            for entry in self._iter_manifests():
+                acf_path = Path(entry.path)
                 try:
                     data = self.log_parser.parse_acf(acf_path)
                     app_id = int(data.get("appid", "0"))
@@ -31,14 +66,17 @@ class GameFinder:
                     logging.warning(f"Skipping ACF due to parse error: {e}")
                     continue
 
-        return self._find_active_game_fallback()
+        return self._find_active_game_fallback(snapshot)
 
-    def _find_active_game_fallback(self) -> Optional[DownloadingGame]:
+    def _find_active_game_fallback(
+        self, snapshot: Optional[LogSnapshot] = None
+    ) -> Optional[DownloadingGame]:
         """Fallback using ACF files."""
         active_games: List[Tuple[float, DownloadingGame]] = []
         paused_games: List[Tuple[float, DownloadingGame]] = []
 
-        for acf_path in self.steamapps.glob("appmanifest_*.acf"):
+        for entry in self._iter_manifests():
+            acf_path = Path(entry.path)
             try:
                 data = self.log_parser.parse_acf(acf_path)
                 app_id = int(data.get("appid", "0"))
@@ -47,21 +85,24 @@ class GameFinder:
 
                 name = data.get("name", "Unknown")
                 flags = int(data.get("StateFlags", "4"))
-                last_modified = acf_path.stat().st_mtime
+                last_modified = entry.stat().st_mtime
                 game = DownloadingGame(app_id, name, acf_path)
 
                 is_recently_paused = (
-                    self.log_parser.get_recent_pause_info(app_id) is not None
+                    self.log_parser.get_recent_pause_info(app_id, snapshot) is not None
                 )
 
-                if is_recently_paused or flags & 512:
+                if is_recently_paused or flags & PAUSED_FLAGS:
                     paused_games.append((last_modified, game))
-                elif flags & (256 | 1024 | 1048576):
-                    if "BytesToDownload" in data and "BytesDownloaded" in data:
-                        bytes_to_dl = int(data["BytesToDownload"])
-                        bytes_dl = int(data["BytesDownloaded"])
-                        if bytes_to_dl > bytes_dl:
-                            active_games.append((last_modified, game))
+                elif flags & DOWNLOADING_FLAGS:
+                    bytes_to_dl = data.get("BytesToDownload")
+                    bytes_dl = data.get("BytesDownloaded")
+                    if (
+                        bytes_to_dl is not None
+                        and bytes_dl is not None
+                        and int(bytes_to_dl) > int(bytes_dl)
+                    ):
+                        active_games.append((last_modified, game))
                 else:
                     paused_games.append((last_modified, game))
             except Exception as e:
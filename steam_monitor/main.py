@@ -6,7 +6,7 @@ from typing import Optional
 from .config import Config
 from .container import Container
 from .errors import SteamNotFoundError
-from .models import DownloadState
+from .models import DownloadSample, DownloadState
 import logging.handlers
 
 
@@ -50,10 +50,12 @@ def main() -> None:
         game_finder = container.game_finder(steam.steamapps, log_parser)
 
         with container.steam_monitor(steam, log_parser, game_finder) as monitor:
+            # Filled in place each poll; nothing keeps earlier samples.
+            sample = DownloadSample(0.0, 0.0, DownloadState.IDLE.value)
             i = 0
             while config.samples == 0 or i < config.samples:
                 try:
-                    sample = monitor.get_current_sample()
+                    monitor.get_current_sample(sample)
                     speed_display = sample.speed_bytes_per_sec
 
                     if sample.status == DownloadState.IDLE.value:
@@ -1,35 +1,34 @@
 import datetime as dt
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Protocol, Dict, Optional
+from typing import Protocol, Mapping, Optional, Sequence
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SteamInstall:
     root: Path
     steamapps: Path
     logs: Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DownloadingGame:
     app_id: int
     name: str
     path: Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Throughput:
     bytes_per_sec: float
+    # Derived once at construction; the instance is immutable.
+    mbps: float = field(init=False, repr=False, compare=False)
+    mb_per_sec: float = field(init=False, repr=False, compare=False)
 
-    @property
-    def mbps(self) -> float:
-        return self.bytes_per_sec * 8 / 1_000_000
-
-    @property
-    def mb_per_sec(self) -> float:
-        return self.bytes_per_sec / 1_000_000
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "mbps", self.bytes_per_sec * 8 / 1_000_000)
+        object.__setattr__(self, "mb_per_sec", self.bytes_per_sec / 1_000_000)
 
 
 class DownloadState(Enum):
@@ -39,7 +38,28 @@ class DownloadState(Enum):
     IDLE = "idle"
 
 
-@dataclass
+# appmanifest StateFlags bits, grouped by the state they indicate.
+PAUSED_FLAGS = 512
+DOWNLOADING_FLAGS = 256 | 1024 | 1048576
+UNPACKING_FLAGS = 2097152 | 4194304
+
+
+@dataclass(frozen=True, slots=True)
+class LogSnapshot:
+    """Parsed log state frozen at one point in time.
+
+    Timestamps are epoch seconds of naive local time; ``now`` is the wall clock
+    when the snapshot was taken, so every query against it agrees on time.
+    """
+
+    now: int
+    latest_rate: Optional[tuple[int, Throughput]]
+    depot_to_app: Mapping[str, str]
+    recent_events: Mapping[int, Sequence[tuple[int, str]]]  # app_id -> [(ts, etype)]
+    rate_entries: Sequence[tuple[int, int, str]]  # [(ts, app_id, rate_str)]
+
+
+@dataclass(slots=True)
 class DownloadSample:
     timestamp: float
     speed_bytes_per_sec: float
@@ -52,18 +72,29 @@ class LogParserProtocol(Protocol):
 
     log_file: Path
 
-    def parse_acf(self, path: Path) -> Dict[str, str]: ...
+    def parse_acf(self, path: Path) -> Mapping[str, str]: ...
+
+    def build_depot_app_mapping(self) -> Mapping[str, str]: ...
 
-    def build_depot_app_mapping(self) -> Dict[str, str]: ...
+    def snapshot(self) -> LogSnapshot: ...
 
-    def get_most_recent_active_download(self) -> Optional[int]: ...
+    def get_most_recent_active_download(
+        self, snapshot: Optional[LogSnapshot] = None
+    ) -> Optional[int]: ...
 
     def get_recent_pause_info(
-        self, app_id: int
+        self, app_id: int, snapshot: Optional[LogSnapshot] = None
     ) -> Optional[tuple[dt.datetime, str]]: ...
 
-    def read_latest_speed(self) -> Optional[tuple[dt.datetime, Throughput]]: ...
+    def read_latest_speed(
+        self, snapshot: Optional[LogSnapshot] = None
+    ) -> Optional[tuple[dt.datetime, Throughput]]: ...
 
     def get_status(
-        self, flags: int, data: Dict[str, str], speed: float, app_id: int
+        self,
+        flags: int,
+        data: Mapping[str, str],
+        speed: float,
+        app_id: int,
+        snapshot: Optional[LogSnapshot] = None,
     ) -> DownloadState: ...
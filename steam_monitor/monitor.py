@@ -1,21 +1,68 @@
+import functools
+import glob
+import threading
 import time
+from typing import Any, Callable, Optional
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import PatternMatchingEventHandler
 from .models import SteamInstall, DownloadSample, DownloadState, LogParserProtocol
 from .game_finder import GameFinder
 import logging
 
+UPDATE_COALESCE_SEC = 0.1
+UPDATE_MAX_DELAY_SEC = 1.0
+POLL_INTERVAL_SEC = 5.0
+
+
+def _make_observer_factory(observer_cls: Callable[..., Any]) -> Callable[..., Any]:
+    """Returns the observer factory, polling every POLL_INTERVAL_SEC on fallback.
+
+    watchdog falls back to stat polling where no native backend loads (e.g. a
+    missing inotify libc or fsevents module). Samples are taken far less often
+    than watchdog's 1 s default poll, so stat the logs directory less often too.
+    """
+    if observer_cls is PollingObserver:
+        return functools.partial(PollingObserver, timeout=POLL_INTERVAL_SEC)
+    return observer_cls
+
+
+Observer = _make_observer_factory(Observer)
+
+# Sample status strings, looked up once instead of through .value per sample.
+_STATUS_STR = {state: state.value for state in DownloadState}
+
+
+class LogHandler(PatternMatchingEventHandler):
+    """Marks the log dirty on modify events; ``flush`` applies the changes."""
 
-class LogHandler(FileSystemEventHandler):
     def __init__(self, log_parser: LogParserProtocol):
+        # Events for the other files in the logs directory are dropped in
+        # dispatch, before any handler method runs.
+        super().__init__(
+            patterns=[glob.escape(str(log_parser.log_file))],
+            ignore_directories=True,
+            case_sensitive=True,
+        )
         self.log_parser = log_parser
+        self.dirty = threading.Event()
+        self.last_modified = 0.0
 
     def on_modified(self, event):
+        # dispatch already filters by path; this guards direct calls.
         if event.src_path == str(self.log_parser.log_file):
-            try:
-                self.log_parser._update_log_state()
-            except Exception as e:
-                logging.warning(f"Error updating log state on file modify: {e}")
+            self.last_modified = time.monotonic()
+            self.dirty.set()
+
+    def flush(self) -> None:
+        """Tails the log once for all modify events received since the last flush."""
+        if not self.dirty.is_set():
+            return
+        self.dirty.clear()
+        try:
+            self.log_parser._update_log_state()
+        except Exception as e:
+            logging.warning(f"Error updating log state on file modify: {e}")
 
 
 class SteamMonitor:
@@ -26,52 +73,89 @@ class SteamMonitor:
         steam: SteamInstall,
         log_parser: LogParserProtocol,
         game_finder: GameFinder,
+        clock: Callable[[], float] = time.time,
     ):
         self.steam = steam
+        self.clock = clock
         self.log_parser = log_parser
         self.game_finder = game_finder
+        self.log_handler = LogHandler(log_parser)
         self.observer = Observer()
-        self.observer.schedule(LogHandler(log_parser), str(steam.logs), recursive=False)
+        self.observer.schedule(self.log_handler, str(steam.logs), recursive=False)
+        self._stop_updates = threading.Event()
+        self._update_thread: Optional[threading.Thread] = None
         self._started = False
 
     def __enter__(self):
         if not self._started:
             self.observer.start()
+            self._stop_updates.clear()
+            self._update_thread = threading.Thread(
+                target=self._coalesce_log_updates, name="log-updates", daemon=True
+            )
+            self._update_thread.start()
             self._started = True
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self._started:
+            self._stop_updates.set()
+            self.log_handler.dirty.set()  # wake the update thread so it can exit
+            self._update_thread.join(timeout=2.0)
             self.observer.stop()
             self.observer.join(timeout=2.0)
             self._started = False
 
-    def get_current_sample(self) -> DownloadSample:
-        game = self.game_finder.find_active_game()
-        timestamp = time.time()
-        speed_entry = self.log_parser.read_latest_speed()
+    def _coalesce_log_updates(self) -> None:
+        """Applies log modifications in batches instead of once per event."""
+        while True:
+            self.log_handler.dirty.wait()
+            # Tail once the write burst goes quiet, but hold changes back for
+            # at most UPDATE_MAX_DELAY_SEC while Steam keeps writing.
+            deadline = time.monotonic() + UPDATE_MAX_DELAY_SEC
+            while True:
+                quiet_at = self.log_handler.last_modified + UPDATE_COALESCE_SEC
+                delay = min(quiet_at, deadline) - time.monotonic()
+                if delay <= 0:
+                    break
+                if self._stop_updates.wait(delay):
+                    return
+            if self._stop_updates.is_set():
+                return
+            self.log_handler.flush()
+
+    def get_current_sample(
+        self, out: Optional[DownloadSample] = None
+    ) -> DownloadSample:
+        """Takes a sample; fills and returns ``out`` instead of allocating if given."""
+        self.log_handler.flush()
+        # One snapshot per sample, so every query sees the same log state.
+        snapshot = self.log_parser.snapshot()
+        game = self.game_finder.find_active_game(snapshot)
+        timestamp = self.clock()
+        speed_entry = self.log_parser.read_latest_speed(snapshot)
         speed_bytes_per_sec = speed_entry[1].bytes_per_sec if speed_entry else 0.0
 
         if not game:
-            return DownloadSample(
-                timestamp=timestamp,
-                speed_bytes_per_sec=0.0,
-                status=DownloadState.IDLE.value,
-            )
-
-        try:
-            data = self.log_parser.parse_acf(game.path)
-            flags = int(data.get("StateFlags", "4"))
-            status = self.log_parser.get_status(
-                flags, data, speed_bytes_per_sec, game.app_id
-            )
-        except Exception as e:
-            logging.warning(f"Error processing sample for game {game.app_id}: {e}")
+            speed_bytes_per_sec = 0.0
             status = DownloadState.IDLE
+        else:
+            try:
+                data = self.log_parser.parse_acf(game.path)
+                flags = int(data.get("StateFlags", "4"))
+                status = self.log_parser.get_status(
+                    flags, data, speed_bytes_per_sec, game.app_id, snapshot
+                )
+            except Exception as e:
+                logging.warning(f"Error processing sample for game {game.app_id}: {e}")
+                status = DownloadState.IDLE
 
-        return DownloadSample(
-            timestamp=timestamp,
-            speed_bytes_per_sec=speed_bytes_per_sec,
-            status=status.value,
-            game=game,
-        )
+        if out is None:
+            return DownloadSample(
+                timestamp, speed_bytes_per_sec, _STATUS_STR[status], game
+            )
+        out.timestamp = timestamp
+        out.speed_bytes_per_sec = speed_bytes_per_sec
+        out.status = _STATUS_STR[status]
+        out.game = game
+        return out
@@ -1,51 +1,99 @@
 import re
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, Optional, Tuple, List
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, Mapping, Optional, Sequence, Tuple
 import datetime as dt
+import os
+import threading
 import time
 
 from .errors import ACFParseError
-from .models import Throughput, DownloadState, LogParserProtocol
+from .models import (
+    DOWNLOADING_FLAGS,
+    PAUSED_FLAGS,
+    UNPACKING_FLAGS,
+    DownloadState,
+    LogParserProtocol,
+    LogSnapshot,
+    Throughput,
+)
 import logging
 
-_LINE_RE = re.compile(
-    r"\[(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\]\s+(?:Current\s+)?Download rate:\s+([\d.]+)\s*(KB/s|MB/s|Mbps)",
-    re.IGNORECASE,
+_TS_PATTERN = r"\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}"
+
+# Line patterns match the remainder of a log line after its "[timestamp]" prefix.
+RATE_PATTERN = (
+    r"\s+(?:Current\s+)?Download rate:\s+(?P<value>[\d.]+)\s*(?P<unit>KB/s|MB/s|Mbps)"
+    r"(?:.*?AppID\s+(?P<app_id>\d+)|.*?depot\s+(?P<depot_id>\d+))?"
 )
 
-PAUSE_PATTERNS = [
-    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\].*?AppID\s+(?P<app_id>\d+)\s+update\s+canceled",
-    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\].*?AppID\s+(?P<app_id>\d+)\s+App update changed.*?Suspended",
-    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\].*?AppID\s+(?P<app_id>\d+)\s+scheduler finished.*?Suspended",
-    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\].*?AppID\s+(?P<app_id>\d+)\s+App update changed.*?Stopping",
+# Events logged as "AppID <id> <keyword>...", in match priority order.
+APPID_EVENT_PATTERNS = [
+    ("pause", r"update\s+canceled"),
+    ("pause", r"App update changed.*?Suspended"),
+    ("pause", r"scheduler finished.*?Suspended"),
+    ("pause", r"App update changed.*?Stopping"),
+    ("start", r"update started"),
+    ("start", r"App update changed.*?Running Update.*?Downloading"),
+    ("network", r"Increasing target number of download connections"),
+    ("network", r"Created download interface"),
 ]
 
-START_PATTERNS = [
-    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\].*?AppID\s+(?P<app_id>\d+)\s+update started",
-    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\].*?AppID\s+(?P<app_id>\d+)\s+App update changed.*?Running Update.*?Downloading",
-    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\].*?Downloading\s+\d+\s+chunks\s+from\s+depot\s+\d+.*?AppID\s+(?P<app_id>\d+)",
-]
+# A depot chunk download both starts the app's download and maps depot to app.
+CHUNKS_PATTERN = (
+    r".*?Downloading\s+\d+\s+chunks\s+from\s+depot\s+(?P<chunk_depot_id>\d+)"
+    r".*?AppID\s+(?P<chunk_app_id>\d+)"
+)
 
-NETWORK_PATTERNS = [
-    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\].*?AppID\s+(?P<app_id>\d+)\s+Increasing target number of download connections",
-    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\].*?AppID\s+(?P<app_id>\d+)\s+Created download interface",
-]
 
-DEPOT_PATTERNS = [
-    r"Downloading\s+\d+\s+chunks\s+from\s+depot\s+(?P<depot_id>\d+).*?AppID\s+(?P<app_id>\d+)",
-]
+def _build_line_re() -> Tuple["re.Pattern[bytes]", Dict[str, str]]:
+    """Fuses all line patterns into one alternation scanned once per log chunk.
+
+    The shared "AppID <id>" prefix of the event patterns is matched once and
+    followed by an alternation of their keywords, each tagged with an empty
+    marker group so ``match.lastgroup`` names the event that fired. Returns the
+    regex and a map from marker group to event type. The regex is compiled as
+    bytes so the log can be scanned without decoding it first. Only rate
+    lines match case-insensitively; event keywords are exact.
+    """
+    markers: Dict[str, str] = {}
+    keywords = []
+    for idx, (etype, pattern) in enumerate(APPID_EVENT_PATTERNS):
+        marker = f"{etype}{idx}"
+        markers[marker] = etype
+        keywords.append(f"{pattern}(?P<{marker}>)")
+    line_pattern = (
+        rf"^\[(?P<ts>{_TS_PATTERN})\](?:"
+        rf"(?P<rate>(?i:{RATE_PATTERN}))"
+        rf"|.*?AppID\s+(?P<event_app_id>\d+)\s+(?:{'|'.join(keywords)})"
+        rf"|(?P<chunk>{CHUNKS_PATTERN})"
+        r")[^\n]*"
+    )
+    # Scanning whole chunks, so keep whitespace classes from crossing lines.
+    line_pattern = line_pattern.replace(r"\s", r"[^\S\n]")
+    regex = re.compile(line_pattern.encode(), re.MULTILINE)
+    return regex, markers
+
+
+_LINE_RE, _EVENT_MARKERS = _build_line_re()
 
 MAX_AGE_SEC = 180
 PRUNE_AGE_SEC = 3600
+ACF_CACHE_SIZE = 256
+UPDATE_DEBOUNCE_SEC = 0.25
+_HAS_PREAD = hasattr(os, "pread")
+# A full load only parses the log tail; PRUNE_AGE_SEC of history fits well within it.
+FULL_LOAD_TAIL_BYTES = 1 << 20
 
 
 def _read_file_with_retry(
     path: Path, retries: int = 3, delay: float = 0.1
-) -> Optional[str]:
+) -> Optional[bytes]:
     """Read file with retry logic for Windows file locking issues."""
     for attempt in range(retries):
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            with open(path, "rb") as f:
                 return f.read()
         except (PermissionError, OSError) as e:
             if attempt < retries - 1:
@@ -56,6 +104,172 @@ def _read_file_with_retry(
     return None
 
 
+def _read_range(path: Path, offset: int, length: int) -> bytes:
+    """Reads up to ``length`` bytes at ``offset`` straight from the descriptor.
+
+    Uses ``os.pread`` where available, so there is no buffered file object or
+    separate seek; Windows falls back to ``lseek`` + ``read``.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        chunks = []
+        while length > 0:
+            if _HAS_PREAD:
+                chunk = os.pread(fd, length, offset)
+            else:
+                os.lseek(fd, offset, os.SEEK_SET)
+                chunk = os.read(fd, length)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+            length -= len(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+# A quoted token, optionally followed by a quoted value. A token without one
+# (a section name followed by "{") is consumed and skipped.
+_VDF_TOKEN_RE = re.compile(rb'"([^"]*)"(?:[ \t\r\n]*"([^"]*)")?')
+
+
+def _parse_vdf_kv(content: bytes) -> Dict[str, str]:
+    """Collects every ``"key" "value"`` pair from raw VDF bytes in a single scan.
+
+    Tokenizing runs in the regex engine; only the captured keys and values are
+    decoded. Nested keys are flattened, later occurrences overwriting earlier
+    ones.
+    """
+    data: Dict[str, str] = {}
+    for match in _VDF_TOKEN_RE.finditer(content):
+        key, value = match.groups()
+        if value is not None:
+            data[key.strip().decode("utf-8", "ignore")] = value.strip().decode(
+                "utf-8", "ignore"
+            )
+    return data
+
+
+_EPOCH = dt.datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_DAY_SECONDS: Dict[bytes, int] = {}  # date prefix -> epoch seconds at midnight
+
+
+def _parse_ts(s: bytes) -> int:
+    """Converts a ``YYYY-MM-DD HH:MM:SS`` log timestamp to epoch seconds.
+
+    Log times are naive local time, so they are counted as if they were UTC
+    and compared against ``_wall_clock()``. The date is validated once and
+    cached; the time is sliced from the end since the regex allows any
+    whitespace run between date and time. Raises ValueError for out-of-range
+    fields.
+    """
+    date = s[:10]
+    day = _DAY_SECONDS.get(date)
+    if day is None:
+        ordinal = dt.date(int(s[0:4]), int(s[5:7]), int(s[8:10])).toordinal()
+        day = _DAY_SECONDS[date] = (ordinal - _EPOCH_ORDINAL) * 86400
+    hour, minute, second = int(s[-8:-6]), int(s[-5:-3]), int(s[-2:])
+    if hour > 23 or minute > 59 or second > 59:
+        raise ValueError(f"Log timestamp out of range: {s!r}")
+    return day + hour * 3600 + minute * 60 + second
+
+
+def _wall_clock() -> int:
+    """Returns the local wall-clock time in the same epoch seconds as ``_parse_ts``."""
+    # Whole seconds, like log timestamps, so recency checks stay int-only.
+    now = time.time_ns() // 1_000_000_000
+    return now + time.localtime(now).tm_gmtoff
+
+
+def _to_datetime(ts: float) -> dt.datetime:
+    """Converts ``_parse_ts`` epoch seconds back to a naive local datetime."""
+    return _EPOCH + dt.timedelta(seconds=ts)
+
+
+def _has_pause_after(events: Sequence[Tuple[int, str]], ts: int) -> bool:
+    """Checks log-ordered events for a pause logged after ``ts``."""
+    for event_ts, etype in reversed(events):
+        if event_ts <= ts:
+            return False
+        if etype == "pause":
+            return True
+    return False
+
+
+def _most_recent_active_download(snapshot: LogSnapshot) -> Optional[int]:
+    """Picks the app with the newest unpaused rate, else the newest start event."""
+    cutoff = snapshot.now - MAX_AGE_SEC
+    recent_events = snapshot.recent_events
+
+    # Rate entries and events are kept in log order, so one newest-first pass
+    # over the rates decides. A pause after an app's newest rate is also after
+    # its older ones, so each paused app's events are scanned at most once.
+    paused = set()
+    for ts, app_id, _ in reversed(snapshot.rate_entries):
+        if ts < cutoff:
+            break
+        if app_id in paused:
+            continue
+        if not _has_pause_after(recent_events.get(app_id, ()), ts):
+            return app_id
+        paused.add(app_id)
+
+    latest_active: Optional[Tuple[int, int]] = None
+    for app_id, events in recent_events.items():
+        latest_event_time, latest_event_type = events[-1]
+        if (
+            latest_event_type in ("start", "network")
+            and latest_event_time >= cutoff
+            and (latest_active is None or latest_event_time > latest_active[0])
+        ):
+            latest_active = (latest_event_time, app_id)
+    return latest_active[1] if latest_active else None
+
+
+def _recent_pause_info(
+    snapshot: LogSnapshot, app_id: int
+) -> Optional[Tuple[dt.datetime, str]]:
+    """Returns the pause time if the app's latest event is a pause."""
+    events = snapshot.recent_events.get(app_id)
+    if not events:
+        return None
+    latest_ts, latest_etype = events[-1]
+    if latest_etype == "pause":
+        return _to_datetime(latest_ts), "paused"
+    return None
+
+
+def _latest_speed(snapshot: LogSnapshot) -> Optional[Tuple[dt.datetime, Throughput]]:
+    """Returns the latest rate unless it is older than MAX_AGE_SEC."""
+    if snapshot.latest_rate:
+        ts, throughput = snapshot.latest_rate
+        if snapshot.now - ts <= MAX_AGE_SEC:
+            return _to_datetime(ts), throughput
+    return None
+
+
+def _classify_status(
+    complete: bool, unpacking: bool, downloading: bool, moving: bool
+) -> DownloadState:
+    """State of an unpaused app with known byte counts, from its flags and speed."""
+    if complete:
+        if unpacking:
+            return DownloadState.UNPACKING
+        return DownloadState.DOWNLOADING if moving else DownloadState.IDLE
+    if downloading:
+        return DownloadState.DOWNLOADING if moving else DownloadState.PAUSED
+    return DownloadState.PAUSED
+
+
+# _classify_status for every input, indexed by the inputs as bits (complete is 8).
+_STATUS_TABLE = tuple(
+    _classify_status(bool(i & 8), bool(i & 4), bool(i & 2), bool(i & 1))
+    for i in range(16)
+)
+
+
 class LogParser(LogParserProtocol):
     """Parses Steam logs with stateful tailing and caching."""
 
@@ -63,14 +277,20 @@ class LogParser(LogParserProtocol):
         self.logs_dir = logs_dir
         self.log_file = logs_dir / "content_log.txt"
         self.last_pos = 0
-        self.latest_rate: Optional[Tuple[dt.datetime, Throughput]] = None
-        self.recent_events: Dict[int, List[Tuple[dt.datetime, str]]] = (
+        self._last_update = 0.0
+        self._lock = threading.RLock()
+        self.latest_rate: Optional[Tuple[int, Throughput]] = None
+        self.recent_events: Dict[int, Deque[Tuple[int, str]]] = (
             {}
         )  # app_id -> [(ts, etype)]
         self.depot_to_app: Dict[str, str] = {}  # depot_id -> app_id
-        self.rate_entries: List[Tuple[dt.datetime, int, str]] = (
-            []
+        self._depot_to_app_view = MappingProxyType(self.depot_to_app)
+        self.rate_entries: Deque[Tuple[int, int, str]] = (
+            deque()
         )  # [(ts, app_id, rate_str)]
+        self._acf_cache: "OrderedDict[Path, Tuple[int, int, Mapping[str, str]]]" = (
+            OrderedDict()
+        )  # path -> (mtime_ns, size, parsed data), least recently used first
 
         if not self.log_file.exists():
             logging.warning(
@@ -80,236 +300,253 @@ class LogParser(LogParserProtocol):
 
         self._update_log_state(full_load=True)
 
+    def _refresh(self) -> None:
+        """Tails the log unless it was already read within UPDATE_DEBOUNCE_SEC.
+
+        Collapses the back-to-back reads issued while taking a single sample;
+        file-modified events still go straight to ``_update_log_state``.
+        """
+        if time.monotonic() - self._last_update < UPDATE_DEBOUNCE_SEC:
+            return
+        self._update_log_state()
+
     def _update_log_state(self, full_load=False) -> None:
         """Updates internal state by tailing the log file incrementally."""
-        if not self.log_file.exists():
+        # Called from both the sampling thread and the monitor's update thread.
+        with self._lock:
+            self._tail_log(full_load)
+
+    def _tail_log(self, full_load: bool) -> None:
+        self._last_update = time.monotonic()
+        try:
+            size = os.stat(self.log_file).st_size
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logging.warning(f"Failed to stat log file {self.log_file}: {e}")
+            return
+
+        if size < self.last_pos:
+            full_load = True
+        if not full_load and size == self.last_pos:
             return
+        start = max(0, size - FULL_LOAD_TAIL_BYTES) if full_load else self.last_pos
 
         try:
-            with open(self.log_file, "r", encoding="utf-8", errors="ignore") as f:
-                f.seek(0, 2)
-                current_size = f.tell()
-
-                if current_size < self.last_pos:
-                    full_load = True
-                    self.last_pos = 0
-
-                if full_load:
-                    f.seek(0)
-                    content = f.read()
-                    self.last_pos = f.tell()
-                    lines = content.splitlines()
-                    self.latest_rate = None
-                    self.recent_events = {}
-                    self.depot_to_app = {}
-                    self.rate_entries = []
-                else:
-                    f.seek(self.last_pos)
-                    new_content = f.read()
-                    self.last_pos = f.tell()
-                    lines = new_content.splitlines()
-                    if not lines:
-                        return
-        except (OSError, IOError) as e:
+            data = _read_range(self.log_file, start, size - start)
+        except OSError as e:
             logging.warning(f"Failed to read log file {self.log_file}: {e}")
             return
 
-        now = dt.datetime.now()
-        all_patterns = PAUSE_PATTERNS + START_PATTERNS + NETWORK_PATTERNS
-        etypes = (
-            ["pause"] * len(PAUSE_PATTERNS)
-            + ["start"] * len(START_PATTERNS)
-            + ["network"] * len(NETWORK_PATTERNS)
-        )
-
-        for line in lines:
-            match = _LINE_RE.search(line)
-            if match:
-                ts_str = match.group("ts").strip()
+        if full_load and start:
+            # The tail starts mid-file, so drop its partial first line.
+            skip = data.find(b"\n") + 1
+            data = data[skip:]
+            start += skip
+        # Only consume complete lines; a partially written one is re-read next time.
+        data = data[: data.rfind(b"\n") + 1]
+        self.last_pos = start + len(data)
+        if full_load:
+            self.latest_rate = None
+            self.recent_events = {}
+            # Cleared in place so _depot_to_app_view keeps wrapping it.
+            self.depot_to_app.clear()
+            self.rate_entries = deque()
+        if not data:
+            return
+
+        # Timestamps are epoch seconds (see _parse_ts), so ages are plain subtraction.
+        now = _wall_clock()
+        last_rate: Optional[Tuple[int, float]] = None
+
+        # Matching runs on raw bytes; only the captured fields are decoded.
+        for match in _LINE_RE.finditer(data):
+            try:
+                ts = _parse_ts(match.group("ts"))
+            except ValueError:
+                continue
+            kind = match.lastgroup
+
+            if kind == "rate":
                 try:
-                    ts = dt.datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-                    if (now - ts).total_seconds() > MAX_AGE_SEC:
-                        continue
-                    value = float(match.group(2))
-                    unit = match.group(3).lower()
-                    if unit == "kb/s":
-                        speed_bytes = value * 1024
-                    elif unit == "mb/s":
-                        speed_bytes = value * 1024 * 1024
-                    elif unit == "mbps":
-                        speed_bytes = value * 1_000_000 / 8
-                    else:
-                        continue
-                    if self.latest_rate is None or ts > self.latest_rate[0]:
-                        self.latest_rate = (ts, Throughput(speed_bytes))
-
-                    app_id_matches = re.findall(r"AppID\s+(\d+)", line)
-                    app_id = None
-                    if app_id_matches:
-                        app_id = int(app_id_matches[0])
-                    else:
-                        depot_matches = re.findall(r"depot\s+(\d+)", line)
-                        if depot_matches:
-                            depot_id = depot_matches[0]
-                            if depot_id in self.depot_to_app:
-                                app_id = int(self.depot_to_app[depot_id])
-                    if app_id is not None:
-                        self.rate_entries.append((ts, app_id, match.group(2)))
+                    value = float(match.group("value"))
                 except ValueError:
                     continue
+                unit = match.group("unit").lower()
+                if unit == b"kb/s":
+                    speed_bytes = value * 1024
+                elif unit == b"mb/s":
+                    speed_bytes = value * 1024 * 1024
+                else:
+                    speed_bytes = value * 1_000_000 / 8
+                last_rate = (ts, speed_bytes)
 
-            for pattern in DEPOT_PATTERNS:
-                match = re.search(pattern, line)
-                if match:
+                app_id_raw = match.group("app_id")
+                if app_id_raw is not None:
+                    app_id_str = app_id_raw.decode()
+                else:
                     depot_id = match.group("depot_id")
-                    app_id = match.group("app_id")
-                    self.depot_to_app[depot_id] = app_id
-
-            app_id_match = re.search(r"AppID\s+(\d+)", line)
-            if app_id_match:
-                app_id = int(app_id_match.group(1))
-                self.recent_events.setdefault(app_id, [])
-                ts_match = re.search(
-                    r"(?P<ts>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})", line
-                )
-                if ts_match:
-                    ts_str = ts_match.group("ts")
-                    try:
-                        ts = dt.datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-                        if (now - ts).total_seconds() > PRUNE_AGE_SEC:
-                            continue
-                        for idx, pattern in enumerate(all_patterns):
-                            if re.search(
-                                pattern.replace("(?P<app_id>\\d+)", str(app_id)), line
-                            ):
-                                etype = etypes[idx]
-                                self.recent_events[app_id].append((ts, etype))
-                                break
-                    except ValueError:
-                        continue
-
-        self.rate_entries = [
-            e
-            for e in self.rate_entries
-            if (now - e[0]).total_seconds() <= PRUNE_AGE_SEC
-        ]
+                    app_id_str = depot_id and self.depot_to_app.get(depot_id.decode())
+                if app_id_str:
+                    self.rate_entries.append(
+                        (ts, int(app_id_str), match.group("value").decode())
+                    )
+                continue
+
+            if kind == "chunk":
+                etype = "start"
+                app_id_str = match.group("chunk_app_id").decode()
+                self.depot_to_app[match.group("chunk_depot_id").decode()] = app_id_str
+                app_id = int(app_id_str)
+            else:
+                etype = _EVENT_MARKERS[kind]
+                app_id = int(match.group("event_app_id"))
+            if now - ts > PRUNE_AGE_SEC:
+                continue
+            events = self.recent_events.get(app_id)
+            if events is None:
+                events = self.recent_events[app_id] = deque()
+            events.append((ts, etype))
+
+        # Log lines are time-ordered, so the delta's last rate is the latest one.
+        if last_rate is not None:
+            self.latest_rate = (last_rate[0], Throughput(last_rate[1]))
+
+        # Entries are appended in log order, so expired ones sit at the head.
+        cutoff = now - PRUNE_AGE_SEC
+        rate_entries = self.rate_entries
+        while rate_entries and rate_entries[0][0] < cutoff:
+            rate_entries.popleft()
         for app_id in list(self.recent_events):
-            self.recent_events[app_id] = [
-                e
-                for e in self.recent_events[app_id]
-                if (now - e[0]).total_seconds() <= PRUNE_AGE_SEC
-            ]
-            if not self.recent_events[app_id]:
+            events = self.recent_events[app_id]
+            while events and events[0][0] < cutoff:
+                events.popleft()
+            if not events:
                 del self.recent_events[app_id]
 
-    def parse_acf(self, path: Path) -> Dict[str, str]:
-        """Parse ACF file with retry logic for Windows file locking."""
-        data: Dict[str, str] = {}
+    def parse_acf(self, path: Path) -> Mapping[str, str]:
+        """Parse ACF file, reusing the cached result while its mtime and size match.
+
+        The result is a read-only view shared with the cache, so one caller
+        cannot change what later reads of the same file see.
+        """
+        try:
+            st = path.stat()
+        except OSError as e:
+            raise ACFParseError(f"Cannot read ACF file {path}: {e}") from e
+
+        cache = self._acf_cache
+        cached = cache.get(path)
+        if (
+            cached is not None
+            and cached[0] == st.st_mtime_ns
+            and cached[1] == st.st_size
+        ):
+            cache.move_to_end(path)
+            return cached[2]
+
+        data = MappingProxyType(self._parse_acf_file(path))
+        cache[path] = (st.st_mtime_ns, st.st_size, data)
+        cache.move_to_end(path)
+        if len(cache) > ACF_CACHE_SIZE:
+            cache.popitem(last=False)
+        return data
 
+    def _parse_acf_file(self, path: Path) -> Dict[str, str]:
+        """Parse ACF file with retry logic for Windows file locking."""
         content = _read_file_with_retry(path)
         if content is None:
             raise ACFParseError(f"Cannot read ACF file {path} after retries")
 
         try:
-            for match in re.finditer(r'"(\s*[^"]+\s*)"\s*"(\s*[^"]+\s*)"', content):
-                key, value = match.groups()
-                data[key.strip()] = value.strip()
+            return _parse_vdf_kv(content)
         except Exception as e:
             raise ACFParseError(f"Failed to parse ACF {path}: {e}") from e
 
-        return data
+    def build_depot_app_mapping(self) -> Mapping[str, str]:
+        """Returns a read-only copy of the cached depot-to-app mapping.
+
+        Copied under the lock, like ``snapshot()``: the monitor's update thread
+        keeps adding depots, which would break iteration over a live view.
+        """
+        with self._lock:
+            self._refresh()
+            return MappingProxyType(dict(self.depot_to_app))
+
+    def snapshot(self) -> LogSnapshot:
+        """Tails the log once and returns a frozen copy of the parsed state."""
+        with self._lock:
+            self._refresh()
+            return LogSnapshot(
+                now=_wall_clock(),
+                latest_rate=self.latest_rate,
+                depot_to_app=MappingProxyType(dict(self.depot_to_app)),
+                recent_events=MappingProxyType(
+                    {
+                        app_id: tuple(events)
+                        for app_id, events in self.recent_events.items()
+                    }
+                ),
+                rate_entries=tuple(self.rate_entries),
+            )
 
-    def build_depot_app_mapping(self) -> Dict[str, str]:
-        """Returns the cached depot-to-app mapping."""
-        self._update_log_state()
-        return self.depot_to_app.copy()
+    def _query(
+        self, query: Callable[..., Any], snapshot: Optional[LogSnapshot], *args: Any
+    ) -> Any:
+        """Runs a query against ``snapshot``, or against the live state if None.
+
+        The live state is wrapped without copying, which is safe because the
+        query runs while the lock is held.
+        """
+        if snapshot is not None:
+            return query(snapshot, *args)
+        with self._lock:
+            self._refresh()
+            live = LogSnapshot(
+                now=_wall_clock(),
+                latest_rate=self.latest_rate,
+                depot_to_app=self._depot_to_app_view,
+                recent_events=self.recent_events,
+                rate_entries=self.rate_entries,
+            )
+            return query(live, *args)
 
-    def get_most_recent_active_download(self) -> Optional[int]:
+    def get_most_recent_active_download(
+        self, snapshot: Optional[LogSnapshot] = None
+    ) -> Optional[int]:
         """Analyzes cached events and rates for most recent active download."""
-        self._update_log_state()
-        now = dt.datetime.now()
-
-        rate_entries = sorted(self.rate_entries, key=lambda x: x[0], reverse=True)
-        for ts, app_id, _ in rate_entries:
-            if (now - ts).total_seconds() <= MAX_AGE_SEC:
-                events = self.recent_events.get(app_id, [])
-                all_events = sorted(events, key=lambda x: x[0])
-                has_later_pause = False
-                for event_ts, event_type in all_events:
-                    if (
-                        event_type == "pause"
-                        and event_ts > ts
-                        and (now - event_ts).total_seconds() <= MAX_AGE_SEC
-                    ):
-                        has_later_pause = True
-                        break
-                if not has_later_pause:
-                    return app_id
-
-        active_apps = []
-        for app_id, events in self.recent_events.items():
-            sorted_events = sorted(events, key=lambda x: x[0])
-            if sorted_events:
-                latest_event_time, latest_event_type = sorted_events[-1]
-                if (
-                    latest_event_type in ["start", "network"]
-                    and (now - latest_event_time).total_seconds() <= MAX_AGE_SEC
-                ):
-                    has_later_pause = any(
-                        event_type == "pause"
-                        and event_time > latest_event_time
-                        and (now - event_time).total_seconds() <= MAX_AGE_SEC
-                        for event_time, event_type in sorted_events
-                    )
-                    if not has_later_pause:
-                        active_apps.append((latest_event_time, app_id))
-        if active_apps:
-            active_apps.sort(key=lambda x: x[0], reverse=True)
-            return active_apps[0][1]
-        return None
+        return self._query(_most_recent_active_download, snapshot)
 
-    def get_recent_pause_info(self, app_id: int) -> Optional[Tuple[dt.datetime, str]]:
+    def get_recent_pause_info(
+        self, app_id: int, snapshot: Optional[LogSnapshot] = None
+    ) -> Optional[Tuple[dt.datetime, str]]:
         """Gets recent pause info using cached events."""
-        self._update_log_state()
-        events = self.recent_events.get(app_id, [])
-        if not events:
-            return None
-        events.sort(key=lambda x: x[0], reverse=True)
-        latest_etype = events[0][1]
-        if latest_etype == "pause":
-            return events[0][0], "paused"
-        return None
+        return self._query(_recent_pause_info, snapshot, app_id)
 
     def get_status(
-        self, flags: int, data: Dict[str, str], speed: float, app_id: int
+        self,
+        flags: int,
+        data: Mapping[str, str],
+        speed: float,
+        app_id: int,
+        snapshot: Optional[LogSnapshot] = None,
     ) -> DownloadState:
         """Determines download state."""
-        pause_info = self.get_recent_pause_info(app_id)
-        if pause_info:
-            return DownloadState.PAUSED
-        if flags & 512:
+        if flags & PAUSED_FLAGS or self.get_recent_pause_info(app_id, snapshot):
             return DownloadState.PAUSED
-        if "BytesToDownload" not in data or "BytesDownloaded" not in data:
+        bytes_to_dl = data.get("BytesToDownload")
+        bytes_dl = data.get("BytesDownloaded")
+        if bytes_to_dl is None or bytes_dl is None:
             return DownloadState.IDLE
-        bytes_to_dl = int(data["BytesToDownload"])
-        bytes_dl = int(data["BytesDownloaded"])
-        if bytes_to_dl == bytes_dl:
-            if flags & (2097152 | 4194304):
-                return DownloadState.UNPACKING
-            if speed > 0:
-                return DownloadState.DOWNLOADING
-            return DownloadState.IDLE
-        if flags & (256 | 1024 | 1048576):
-            return DownloadState.DOWNLOADING if speed > 0 else DownloadState.PAUSED
-        return DownloadState.PAUSED
+        return _STATUS_TABLE[
+            (int(bytes_to_dl) == int(bytes_dl)) << 3
+            | (flags & UNPACKING_FLAGS != 0) << 2
+            | (flags & DOWNLOADING_FLAGS != 0) << 1
+            | (speed > 0)
+        ]
 
-    def read_latest_speed(self) -> Optional[Tuple[dt.datetime, Throughput]]:
+    def read_latest_speed(
+        self, snapshot: Optional[LogSnapshot] = None
+    ) -> Optional[Tuple[dt.datetime, Throughput]]:
         """Reads latest speed from cached state, returns None if stale."""
-        self._update_log_state()
-
-        if self.latest_rate:
-            age = (dt.datetime.now() - self.latest_rate[0]).total_seconds()
-            if age <= MAX_AGE_SEC:
-                return self.latest_rate
-
-        return None
+        return self._query(_latest_speed, snapshot)
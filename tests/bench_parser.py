@@ -0,0 +1,129 @@
+"""Micro-benchmarks for the parser and monitor hot paths.
+
+The ``bench_`` prefix keeps this file out of a plain ``pytest`` run (see
+``python_files``); run it with ``pytest tests/bench_parser.py --benchmark-only``,
+as CI does.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+from steam_monitor.models import DownloadingGame, Throughput
+from steam_monitor.monitor import SteamMonitor
+from steam_monitor.parser import FULL_LOAD_TAIL_BYTES, LogParser
+
+_ACF = b"""
+"AppState"
+{
+\t"appid"\t\t"12345"
+\t"name"\t\t"Test Game"
+\t"StateFlags"\t\t"1026"
+\t"BytesDownloaded"\t\t"1000000"
+\t"BytesToDownload"\t\t"5000000"
+\t"UserConfig"
+\t{
+\t\t"language"\t\t"english"
+\t}
+}
+"""
+
+
+def _log_lines(count: int) -> bytes:
+    """Synthetic content_log.txt mixing every line kind the parser matches."""
+    start = datetime.now() - timedelta(seconds=count)
+    templates = (
+        "Downloading 50 chunks from depot 12346 AppID 12345",
+        "Download rate: 10.5 MB/s AppID 12345",
+        "AppID 12345 update started : download 0/5000000",
+        "Some unrelated line about depot verification",
+    )
+    lines = []
+    for i in range(count):
+        ts = (start + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S")
+        lines.append(f"[{ts}] {templates[i % len(templates)]}\n")
+    return "".join(lines).encode()
+
+
+class TestParserBenchmarks:
+    """Benchmarks for LogParser."""
+
+    @pytest.fixture
+    def temp_logs_dir(self, tmp_path):
+        """Create a temporary logs directory."""
+        logs_dir = tmp_path / "logs"
+        logs_dir.mkdir()
+        return logs_dir
+
+    @pytest.fixture
+    def acf_file(self, tmp_path):
+        """Write a typical appmanifest."""
+        path = tmp_path / "appmanifest_12345.acf"
+        path.write_bytes(_ACF)
+        return path
+
+    def test_bench_parse_acf_uncached(self, benchmark, acf_file, temp_logs_dir):
+        """Tokenize an ACF file on every call."""
+        parser = LogParser(temp_logs_dir)
+
+        def parse():
+            parser._acf_cache.clear()
+            return parser.parse_acf(acf_file)
+
+        assert benchmark(parse)["appid"] == "12345"
+
+    def test_bench_parse_acf_cached(self, benchmark, acf_file, temp_logs_dir):
+        """Serve an unchanged ACF file from the cache."""
+        parser = LogParser(temp_logs_dir)
+        assert benchmark(parser.parse_acf, acf_file)["appid"] == "12345"
+
+    def test_bench_full_load(self, benchmark, temp_logs_dir):
+        """Parse the log tail from scratch, as on startup or truncation."""
+        log = _log_lines(40_000)
+        assert len(log) > FULL_LOAD_TAIL_BYTES
+        (temp_logs_dir / "content_log.txt").write_bytes(log)
+        parser = LogParser(temp_logs_dir)
+
+        benchmark(parser._update_log_state, full_load=True)
+        assert parser.read_latest_speed() is not None
+
+    def test_bench_tail_delta(self, benchmark, temp_logs_dir):
+        """Tail a small appended delta, as the update thread does per burst."""
+        log_file = temp_logs_dir / "content_log.txt"
+        base = _log_lines(1_000)
+        delta = _log_lines(20)
+
+        def setup():
+            # Fresh file and parser per round, so every round tails the same delta.
+            log_file.write_bytes(base)
+            parser = LogParser(temp_logs_dir)
+            with open(log_file, "ab") as f:
+                f.write(delta)
+            return (parser,), {}
+
+        benchmark.pedantic(LogParser._update_log_state, setup=setup, rounds=200)
+
+    def test_bench_read_latest_speed(self, benchmark, temp_logs_dir):
+        """Query the latest speed from already tailed state."""
+        (temp_logs_dir / "content_log.txt").write_bytes(_log_lines(1_000))
+        parser = LogParser(temp_logs_dir)
+        assert benchmark(parser.read_latest_speed) is not None
+
+
+@pytest.mark.usefixtures("mock_observer")
+class TestMonitorBenchmarks:
+    """Benchmarks for SteamMonitor with fake collaborators."""
+
+    def test_bench_get_current_sample(
+        self, benchmark, mock_steam_install, mock_parser, mock_game_finder
+    ):
+        """Take a downloading sample into a reused DownloadSample."""
+        mock_game_finder.find_active_game_ret = DownloadingGame(
+            app_id=12345,
+            name="Test Game",
+            path=Path("/steam/steamapps/appmanifest_12345.acf"),
+        )
+        mock_parser.read_latest_speed_ret = (datetime.now(), Throughput(1e7))
+        monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
+        sample = monitor.get_current_sample()
+
+        benchmark(monitor.get_current_sample, sample)
@@ -0,0 +1,173 @@
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+import pytest
+from steam_monitor.models import DownloadingGame, DownloadState, SteamInstall
+
+# Manifest contents for tests where parse_acf is mocked and only the file matters.
+_ACF_BYTES = b'"AppState" { }'
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--cached",
+        action="store_true",
+        help="Hardlink test manifests from the pytest cache instead of copying them",
+    )
+
+
+@pytest.fixture(scope="session")
+def _steam_template(tmp_path_factory):
+    """Build an empty Steam root with steamapps and logs once per session."""
+    root = tmp_path_factory.mktemp("steam_tpl")
+    (root / "steamapps").mkdir()
+    (root / "logs").mkdir()
+    return root
+
+
+@pytest.fixture
+def steam_dirs(tmp_path, _steam_template):
+    """Copy the Steam root template into this test's tmp_path."""
+    root = tmp_path / "steam"
+    shutil.copytree(_steam_template, root, dirs_exist_ok=True)
+    return root
+
+
+@pytest.fixture(scope="session")
+def _acf_template(request, tmp_path_factory):
+    """Placeholder manifest, kept in the pytest cache so re-runs skip the write."""
+    cache = getattr(request.config, "cache", None)  # None with -p no:cacheprovider
+    acf_dir = Path(cache.mkdir("acf")) if cache else tmp_path_factory.mktemp("acf")
+    path = acf_dir / "appmanifest.acf"
+    if not path.exists() or path.read_bytes() != _ACF_BYTES:
+        # xdist workers share the cache, so never expose a half-written file.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(_ACF_BYTES)
+        os.replace(tmp, path)
+    return path
+
+
+@pytest.fixture
+def cached_acf(request, _acf_template):
+    """Returns a function placing the placeholder manifest at a given path.
+
+    With ``--cached`` the file is hardlinked to the template, so tests that
+    change its metadata must pass ``private=True`` to get a real copy.
+    """
+    link = request.config.getoption("--cached")
+
+    def place(dst: Path, private: bool = False) -> Path:
+        if link and not private:
+            try:
+                os.link(_acf_template, dst)
+                return dst
+            except OSError:
+                pass  # e.g. cache and tmp_path on different filesystems
+        shutil.copy(_acf_template, dst)
+        return dst
+
+    return place
+
+
+@pytest.fixture
+def mock_observer():
+    """Replace the watchdog Observer used by SteamMonitor with a mock."""
+    with patch("steam_monitor.monitor.Observer") as observer:
+        yield observer
+
+
+@pytest.fixture
+def mock_steam_install():
+    """Create a mock SteamInstall."""
+    return SteamInstall(
+        root=Path("/steam"),
+        steamapps=Path("/steam/steamapps"),
+        logs=Path("/steam/logs"),
+    )
+
+
+@dataclass
+class FakeParser:
+    """LogParser stand-in returning canned answers and recording what it was asked."""
+
+    log_file: Path = Path("/steam/logs/content_log.txt")
+    read_latest_speed_ret: Any = None
+    parse_acf_ret: Dict[str, str] = field(
+        default_factory=lambda: {
+            "appid": "12345",
+            "name": "Test Game",
+            "StateFlags": "256",
+            "BytesDownloaded": "1000000",
+            "BytesToDownload": "5000000",
+        }
+    )
+    parse_acf_side: Any = None  # callable computing the result, or an exception
+    get_most_recent_active_download_ret: Optional[int] = None
+    get_recent_pause_info_ret: Any = None
+    get_status_ret: DownloadState = DownloadState.DOWNLOADING
+    snapshot_ret: Any = field(default_factory=object)
+    snapshots_taken: int = 0
+    queried_with: List[Any] = field(default_factory=list)  # snapshot per query
+    parsed: List[Path] = field(default_factory=list)
+    updates: int = 0
+
+    def _update_log_state(self) -> None:
+        self.updates += 1
+
+    def snapshot(self) -> Any:
+        self.snapshots_taken += 1
+        return self.snapshot_ret
+
+    def read_latest_speed(self, snapshot=None) -> Any:
+        self.queried_with.append(snapshot)
+        return self.read_latest_speed_ret
+
+    def parse_acf(self, path: Path) -> Dict[str, str]:
+        self.parsed.append(path)
+        if isinstance(self.parse_acf_side, BaseException):
+            raise self.parse_acf_side
+        if self.parse_acf_side is not None:
+            return self.parse_acf_side(path)
+        return self.parse_acf_ret
+
+    def build_depot_app_mapping(self) -> Dict[str, str]:
+        return {}
+
+    def get_most_recent_active_download(self, snapshot=None) -> Optional[int]:
+        self.queried_with.append(snapshot)
+        return self.get_most_recent_active_download_ret
+
+    def get_recent_pause_info(self, app_id: int, snapshot=None) -> Any:
+        self.queried_with.append(snapshot)
+        return self.get_recent_pause_info_ret
+
+    def get_status(self, flags, data, speed, app_id, snapshot=None) -> DownloadState:
+        self.queried_with.append(snapshot)
+        return self.get_status_ret
+
+
+@dataclass
+class FakeGameFinder:
+    """GameFinder stand-in returning a fixed game and recording snapshots."""
+
+    find_active_game_ret: Optional[DownloadingGame] = None
+    queried_with: List[Any] = field(default_factory=list)
+
+    def find_active_game(self, snapshot=None) -> Optional[DownloadingGame]:
+        self.queried_with.append(snapshot)
+        return self.find_active_game_ret
+
+
+@pytest.fixture
+def mock_parser():
+    """Create a fake LogParser."""
+    return FakeParser()
+
+
+@pytest.fixture
+def mock_game_finder():
+    """Create a fake GameFinder."""
+    return FakeGameFinder()
@@ -1,39 +1,41 @@
+import pytest
 from steam_monitor.container import Container
-from steam_monitor.finder import SteamFinder
-from steam_monitor.parser import LogParser
-from steam_monitor.game_finder import GameFinder
-from steam_monitor.monitor import SteamMonitor
-from steam_monitor.models import SteamInstall
+
+
+@pytest.fixture(scope="module")
+def container():
+    """Share one Container across tests; its factories still build fresh objects."""
+    return Container()
 
 
 class TestContainer:
     """Tests for dependency injection container."""
 
-    def test_steam_finder(self):
+    def test_steam_finder(self, container):
         """Test that container creates SteamFinder."""
-        container = Container()
+        from steam_monitor.finder import SteamFinder
+
         finder = container.steam_finder()
         assert isinstance(finder, SteamFinder)
 
-    def test_log_parser(self, tmp_path):
+    def test_log_parser(self, steam_dirs, container):
         """Test that container creates LogParser."""
-        logs_dir = tmp_path / "logs"
-        logs_dir.mkdir()
+        from steam_monitor.parser import LogParser
+
+        logs_dir = steam_dirs / "logs"
 
-        container = Container()
         parser = container.log_parser(logs_dir)
 
         assert isinstance(parser, LogParser)
         assert parser.logs_dir == logs_dir
 
-    def test_game_finder(self, tmp_path):
+    def test_game_finder(self, steam_dirs, container):
         """Test that container creates GameFinder."""
-        steamapps = tmp_path / "steamapps"
-        steamapps.mkdir()
-        logs_dir = tmp_path / "logs"
-        logs_dir.mkdir()
+        from steam_monitor.game_finder import GameFinder
+
+        steamapps = steam_dirs / "steamapps"
+        logs_dir = steam_dirs / "logs"
 
-        container = Container()
         parser = container.log_parser(logs_dir)
         game_finder = container.game_finder(steamapps, parser)
 
@@ -41,16 +43,16 @@ class TestContainer:
         assert game_finder.steamapps == steamapps
         assert game_finder.log_parser == parser
 
-    def test_steam_monitor(self, tmp_path):
+    def test_steam_monitor(self, steam_dirs, container):
         """Test that container creates SteamMonitor."""
-        steamapps = tmp_path / "steamapps"
-        steamapps.mkdir()
-        logs_dir = tmp_path / "logs"
-        logs_dir.mkdir()
+        from steam_monitor.models import SteamInstall
+        from steam_monitor.monitor import SteamMonitor
+
+        steamapps = steam_dirs / "steamapps"
+        logs_dir = steam_dirs / "logs"
 
-        steam = SteamInstall(root=tmp_path, steamapps=steamapps, logs=logs_dir)
+        steam = SteamInstall(root=steam_dirs, steamapps=steamapps, logs=logs_dir)
 
-        container = Container()
         parser = container.log_parser(logs_dir)
         game_finder = container.game_finder(steamapps, parser)
         monitor = container.steam_monitor(steam, parser, game_finder)
@@ -60,12 +62,9 @@ class TestContainer:
         assert monitor.log_parser == parser
         assert monitor.game_finder == game_finder
 
-    def test_container_creates_independent_instances(self, tmp_path):
+    def test_container_creates_independent_instances(self, steam_dirs, container):
         """Test that container creates independent instances."""
-        logs_dir = tmp_path / "logs"
-        logs_dir.mkdir()
-
-        container = Container()
+        logs_dir = steam_dirs / "logs"
 
         parser1 = container.log_parser(logs_dir)
         parser2 = container.log_parser(logs_dir)
@@ -73,16 +72,18 @@ class TestContainer:
         # Should be different instances
         assert parser1 is not parser2
 
-    def test_full_dependency_chain(self, tmp_path):
+    def test_full_dependency_chain(self, steam_dirs, container):
         """Test creating full dependency chain through container."""
-        steamapps = tmp_path / "steamapps"
-        steamapps.mkdir()
-        logs_dir = tmp_path / "logs"
-        logs_dir.mkdir()
+        from steam_monitor.finder import SteamFinder
+        from steam_monitor.game_finder import GameFinder
+        from steam_monitor.models import SteamInstall
+        from steam_monitor.monitor import SteamMonitor
+        from steam_monitor.parser import LogParser
 
-        steam = SteamInstall(root=tmp_path, steamapps=steamapps, logs=logs_dir)
+        steamapps = steam_dirs / "steamapps"
+        logs_dir = steam_dirs / "logs"
 
-        container = Container()
+        steam = SteamInstall(root=steam_dirs, steamapps=steamapps, logs=logs_dir)
 
         # Create all dependencies
         finder = container.steam_finder()
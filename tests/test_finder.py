@@ -1,113 +1,141 @@
 import sys
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 from steam_monitor.finder import (
     SteamFinder,
     _find_linux_steam,
     _find_macos_steam,
-    _find_windows_steam,
 )
 from steam_monitor.errors import SteamNotFoundError
 
 
+@pytest.fixture
+def finder_path(monkeypatch):
+    """Swap finder's Path for a throwaway subclass that tests can stub freely.
+
+    Leaves pathlib.Path itself, which pytest also uses, untouched.
+    """
+    fake = type("FakePath", (type(Path()),), {})
+    monkeypatch.setattr("steam_monitor.finder.Path", fake)
+    return fake
+
+
 @pytest.mark.skipif(sys.platform != "win32", reason="Windows-only test")
 class TestWindowsSteamFinder:
     """Tests for Windows Steam detection."""
 
-    @patch("winreg.OpenKey")
-    @patch("winreg.QueryValueEx")
-    @patch("steam_monitor.finder.Path.exists", return_value=True)
-    def test_find_windows_steam_success(self, mock_exists, mock_query, mock_open):
+    @pytest.fixture(autouse=True)
+    def _registry(self, monkeypatch):
+        """Replace the Steam registry key with a mock."""
+        monkeypatch.setattr("winreg.OpenKey", MagicMock())
+        monkeypatch.setattr("winreg.QueryValueEx", MagicMock())
+
+    def test_find_windows_steam_success(self, monkeypatch, finder_path):
         """Test successful Windows Steam detection."""
-        mock_query.return_value = ("C:\\Program Files (x86)\\Steam", 1)
+        monkeypatch.setattr(
+            "winreg.QueryValueEx",
+            MagicMock(return_value=("C:\\Program Files (x86)\\Steam", 1)),
+        )
+        finder_path.exists = lambda self: True
+        from steam_monitor.finder import _find_windows_steam
+
         steam_install = _find_windows_steam()
 
         assert steam_install is not None
         assert str(steam_install.root) == "C:\\Program Files (x86)\\Steam"
 
-    @patch("winreg.OpenKey", side_effect=FileNotFoundError())
-    def test_find_windows_steam_registry_error(self, mock_open):
+    def test_find_windows_steam_registry_error(self, monkeypatch):
         """Test Windows detection when registry access fails."""
+        monkeypatch.setattr(
+            "winreg.OpenKey", MagicMock(side_effect=FileNotFoundError())
+        )
+        from steam_monitor.finder import _find_windows_steam
+
         steam_install = _find_windows_steam()
         assert steam_install is None
 
-    @patch("winreg.OpenKey")
-    @patch("winreg.QueryValueEx")
-    @patch("steam_monitor.finder.Path.exists", return_value=False)
-    def test_find_windows_steam_missing_dirs(self, mock_exists, mock_query, mock_open):
+    def test_find_windows_steam_missing_dirs(self, monkeypatch, finder_path):
         """Test Windows detection when directories don't exist."""
-        mock_query.return_value = ("C:\\Fake\\Steam", 1)
+        monkeypatch.setattr(
+            "winreg.QueryValueEx", MagicMock(return_value=("C:\\Fake\\Steam", 1))
+        )
+        finder_path.exists = lambda self: False
+        from steam_monitor.finder import _find_windows_steam
+
         steam_install = _find_windows_steam()
         assert steam_install is None
 
 
+class TestWindowsRegistryUnavailable:
+    """Tests for Windows detection without the winreg module."""
+
+    def test_find_windows_steam_without_winreg(self, monkeypatch):
+        """Test that Windows detection reports nothing when winreg is missing."""
+        monkeypatch.setattr("steam_monitor.finder.winreg", None)
+        from steam_monitor.finder import _find_windows_steam
+
+        assert _find_windows_steam() is None
+
+
 class TestLinuxSteamFinder:
     """Tests for Linux Steam detection."""
 
-    @patch("pathlib.Path.home")
-    def test_find_linux_steam_success(self, mock_home):
-        """Test successful Linux Steam detection."""
-        mock_home.return_value = Path("/home/user")
+    @pytest.fixture(autouse=True)
+    def _home(self, finder_path):
+        """Point Path.home() at a fixed Linux home directory."""
+        finder_path.home = classmethod(lambda cls: cls("/home/user"))
+        finder_path.resolve = lambda self: type(self)(
+            "/home/user/.steam/debian-installation"
+        )
 
-        with patch("pathlib.Path.exists") as mock_exists:
-            with patch("pathlib.Path.resolve") as mock_resolve:
-                mock_exists.return_value = True
-                mock_resolve.return_value = Path(
-                    "/home/user/.steam/debian-installation"
-                )
+    def test_find_linux_steam_success(self, finder_path):
+        """Test successful Linux Steam detection."""
+        finder_path.exists = lambda self: True
 
-                result = _find_linux_steam()
-                assert result is not None
-                assert result.root == Path("/home/user/.steam/debian-installation")
+        result = _find_linux_steam()
+        assert result is not None
+        assert result.root == Path("/home/user/.steam/debian-installation")
 
-    @patch("pathlib.Path.home")
-    def test_find_linux_steam_no_symlink(self, mock_home):
+    def test_find_linux_steam_no_symlink(self, finder_path):
         """Test Linux detection when symlink doesn't exist."""
-        mock_home.return_value = Path("/home/user")
+        finder_path.exists = lambda self: False
 
-        with patch("pathlib.Path.exists", return_value=False):
-            result = _find_linux_steam()
-            assert result is None
+        result = _find_linux_steam()
+        assert result is None
 
-    @patch("pathlib.Path.home")
-    def test_find_linux_steam_missing_dirs(self, mock_home):
+    def test_find_linux_steam_missing_dirs(self, finder_path):
         """Test Linux detection when required directories are missing."""
-        mock_home.return_value = Path("/home/user")
-
-        with patch("pathlib.Path.exists") as mock_exists:
-            with patch("pathlib.Path.resolve") as mock_resolve:
-                # Symlink exists but directories don't
-                mock_exists.side_effect = [True, False, False]
-                mock_resolve.return_value = Path(
-                    "/home/user/.steam/debian-installation"
-                )
+        # Symlink exists but directories don't
+        answers = iter([True, False, False])
+        finder_path.exists = lambda self: next(answers)
 
-                result = _find_linux_steam()
-                assert result is None
+        result = _find_linux_steam()
+        assert result is None
 
 
 class TestMacOSSteamFinder:
     """Tests for macOS Steam detection."""
 
-    @patch("pathlib.Path.home")
-    def test_find_macos_steam_success(self, mock_home):
+    @pytest.fixture(autouse=True)
+    def _home(self, finder_path):
+        """Point Path.home() at a fixed macOS home directory."""
+        finder_path.home = classmethod(lambda cls: cls("/Users/user"))
+
+    def test_find_macos_steam_success(self, finder_path):
         """Test successful macOS Steam detection."""
-        mock_home.return_value = Path("/Users/user")
+        finder_path.exists = lambda self: True
 
-        with patch("pathlib.Path.exists", return_value=True):
-            result = _find_macos_steam()
-            assert result is not None
-            assert result.root == Path("/Users/user/Library/Application Support/Steam")
+        result = _find_macos_steam()
+        assert result is not None
+        assert result.root == Path("/Users/user/Library/Application Support/Steam")
 
-    @patch("pathlib.Path.home")
-    def test_find_macos_steam_missing_dirs(self, mock_home):
+    def test_find_macos_steam_missing_dirs(self, finder_path):
         """Test macOS detection when directories don't exist."""
-        mock_home.return_value = Path("/Users/user")
+        finder_path.exists = lambda self: False
 
-        with patch("pathlib.Path.exists", return_value=False):
-            result = _find_macos_steam()
-            assert result is None
+        result = _find_macos_steam()
+        assert result is None
 
 
 class TestSteamFinder:
@@ -122,7 +150,7 @@ class TestSteamFinder:
         logs.mkdir()
 
         finder = SteamFinder()
-        result = finder.find(custom_path=str(tmp_path))
+        result = finder.find(custom_path=tmp_path)
 
         assert result.root == tmp_path
         assert result.steamapps == steamapps
@@ -132,60 +160,64 @@ class TestSteamFinder:
         """Test finding Steam with custom path missing required directories."""
         finder = SteamFinder()
         with pytest.raises(SteamNotFoundError) as exc_info:
-            finder.find(custom_path=str(tmp_path))
+            finder.find(custom_path=tmp_path)
         assert "missing steamapps or logs directory" in str(exc_info.value)
 
-    @patch("platform.system", return_value="Windows")
-    @patch("steam_monitor.finder._find_windows_steam")
-    def test_find_windows_auto(self, mock_find_windows, mock_platform):
+    def test_find_windows_auto(self, monkeypatch):
         """Test auto-detection on Windows."""
-        mock_install = MagicMock()
-        mock_find_windows.return_value = mock_install
+        mock_install = object()
+        mock_find_windows = MagicMock(return_value=mock_install)
+        monkeypatch.setattr("steam_monitor.finder.sys.platform", "win32")
+        monkeypatch.setattr(
+            "steam_monitor.finder._find_windows_steam", mock_find_windows
+        )
 
         finder = SteamFinder()
         result = finder.find()
 
-        assert result == mock_install
+        assert result is mock_install
         mock_find_windows.assert_called_once()
 
-    @patch("platform.system", return_value="Linux")
-    @patch("steam_monitor.finder._find_linux_steam")
-    def test_find_linux_auto(self, mock_find_linux, mock_platform):
+    def test_find_linux_auto(self, monkeypatch):
         """Test auto-detection on Linux."""
-        mock_install = MagicMock()
-        mock_find_linux.return_value = mock_install
+        mock_install = object()
+        mock_find_linux = MagicMock(return_value=mock_install)
+        monkeypatch.setattr("steam_monitor.finder.sys.platform", "linux")
+        monkeypatch.setattr("steam_monitor.finder._find_linux_steam", mock_find_linux)
 
         finder = SteamFinder()
         result = finder.find()
 
-        assert result == mock_install
+        assert result is mock_install
         mock_find_linux.assert_called_once()
 
-    @patch("platform.system", return_value="Darwin")
-    @patch("steam_monitor.finder._find_macos_steam")
-    def test_find_macos_auto(self, mock_find_macos, mock_platform):
+    def test_find_macos_auto(self, monkeypatch):
         """Test auto-detection on macOS."""
-        mock_install = MagicMock()
-        mock_find_macos.return_value = mock_install
+        mock_install = object()
+        mock_find_macos = MagicMock(return_value=mock_install)
+        monkeypatch.setattr("steam_monitor.finder.sys.platform", "darwin")
+        monkeypatch.setattr("steam_monitor.finder._find_macos_steam", mock_find_macos)
 
         finder = SteamFinder()
         result = finder.find()
 
-        assert result == mock_install
+        assert result is mock_install
         mock_find_macos.assert_called_once()
 
-    @patch("platform.system", return_value="FreeBSD")
-    def test_find_unsupported_platform(self, mock_platform):
+    def test_find_unsupported_platform(self, monkeypatch):
         """Test finding Steam on unsupported platform."""
+        monkeypatch.setattr("steam_monitor.finder.sys.platform", "freebsd14")
         finder = SteamFinder()
         with pytest.raises(SteamNotFoundError) as exc_info:
             finder.find()
-        assert "Steam not found on FreeBSD" in str(exc_info.value)
+        assert "Steam not found on freebsd14" in str(exc_info.value)
 
-    @patch("platform.system", return_value="Windows")
-    @patch("steam_monitor.finder._find_windows_steam", return_value=None)
-    def test_find_steam_not_installed(self, mock_find_windows, mock_platform):
+    def test_find_steam_not_installed(self, monkeypatch):
         """Test when Steam is not installed."""
+        monkeypatch.setattr("steam_monitor.finder.sys.platform", "win32")
+        monkeypatch.setattr(
+            "steam_monitor.finder._find_windows_steam", MagicMock(return_value=None)
+        )
         finder = SteamFinder()
         with pytest.raises(SteamNotFoundError) as exc_info:
             finder.find()
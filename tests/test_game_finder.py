@@ -1,4 +1,5 @@
-from unittest.mock import MagicMock
+import os
+from datetime import datetime
 import pytest
 from steam_monitor.game_finder import GameFinder
 
@@ -7,27 +8,9 @@ class TestGameFinder:
     """Tests for GameFinder class."""
 
     @pytest.fixture
-    def temp_steamapps(self, tmp_path):
+    def temp_steamapps(self, steam_dirs):
         """Create a temporary steamapps directory."""
-        steamapps = tmp_path / "steamapps"
-        steamapps.mkdir()
-        return steamapps
-
-    @pytest.fixture
-    def mock_parser(self):
-        """Create a mock LogParser."""
-        parser = MagicMock()
-        parser.parse_acf.return_value = {
-            "appid": "12345",
-            "name": "Test Game",
-            "StateFlags": "256",
-            "BytesDownloaded": "1000000",
-            "BytesToDownload": "5000000",
-        }
-        parser.build_depot_app_mapping.return_value = {}
-        parser.get_most_recent_active_download.return_value = None
-        parser.get_recent_pause_info.return_value = None
-        return parser
+        return steam_dirs / "steamapps"
 
     def test_initialization(self, temp_steamapps, mock_parser):
         """Test GameFinder initialization."""
@@ -35,15 +18,15 @@ class TestGameFinder:
         assert finder.steamapps == temp_steamapps
         assert finder.log_parser == mock_parser
 
-    def test_find_active_game_from_logs(self, temp_steamapps, mock_parser):
+    def test_find_active_game_from_logs(self, temp_steamapps, mock_parser, cached_acf):
         """Test finding active game using log data."""
         # Create ACF file
         acf_file = temp_steamapps / "appmanifest_12345.acf"
-        acf_file.write_text('"AppState" { "appid" "12345" "name" "Test Game" }')
+        cached_acf(acf_file)
 
         # Mock parser to return app_id from logs
-        mock_parser.get_most_recent_active_download.return_value = 12345
-        mock_parser.parse_acf.return_value = {"appid": "12345", "name": "Test Game"}
+        mock_parser.get_most_recent_active_download_ret = 12345
+        mock_parser.parse_acf_ret = {"appid": "12345", "name": "Test Game"}
 
         finder = GameFinder(temp_steamapps, mock_parser)
         game = finder.find_active_game()
@@ -53,73 +36,85 @@ class TestGameFinder:
         assert game.name == "Test Game"
         assert game.path == acf_file
 
-    def test_find_active_game_fallback_active(self, temp_steamapps, mock_parser):
-        """Test fallback to ACF files when logs don't help."""
-        # Create ACF file for downloading game
-        acf_file = temp_steamapps / "appmanifest_12345.acf"
-        acf_file.write_text('"AppState" { }')
-
-        # Mock parser
-        mock_parser.get_most_recent_active_download.return_value = None
-        mock_parser.parse_acf.return_value = {
-            "appid": "12345",
-            "name": "Test Game",
-            "StateFlags": "256",  # Downloading flag
-            "BytesDownloaded": "1000000",
-            "BytesToDownload": "5000000",
-        }
-        mock_parser.get_recent_pause_info.return_value = None
-
-        finder = GameFinder(temp_steamapps, mock_parser)
-        game = finder.find_active_game()
-
-        assert game is not None
-        assert game.app_id == 12345
-
-    def test_find_active_game_fallback_paused(self, temp_steamapps, mock_parser):
-        """Test fallback finds paused game when no active games."""
-        # Create ACF file for paused game
-        acf_file = temp_steamapps / "appmanifest_12345.acf"
-        acf_file.write_text('"AppState" { }')
-
-        # Mock parser
-        mock_parser.get_most_recent_active_download.return_value = None
-        mock_parser.parse_acf.return_value = {
-            "appid": "12345",
-            "name": "Test Game",
-            "StateFlags": "512",  # Paused flag
-            "BytesDownloaded": "1000000",
-            "BytesToDownload": "5000000",
-        }
-        mock_parser.get_recent_pause_info.return_value = None
+    @pytest.mark.parametrize(
+        "acf,expect_app_id",
+        [
+            # Downloading flag with bytes left is an active download.
+            (
+                {
+                    "appid": "12345",
+                    "name": "Test Game",
+                    "StateFlags": "256",
+                    "BytesDownloaded": "1000000",
+                    "BytesToDownload": "5000000",
+                },
+                12345,
+            ),
+            # A paused game is still returned when nothing is active.
+            (
+                {
+                    "appid": "12345",
+                    "name": "Test Game",
+                    "StateFlags": "512",
+                    "BytesDownloaded": "1000000",
+                    "BytesToDownload": "5000000",
+                },
+                12345,
+            ),
+            # A completed download is skipped.
+            (
+                {
+                    "appid": "12345",
+                    "name": "Test Game",
+                    "StateFlags": "256",
+                    "BytesDownloaded": "5000000",
+                    "BytesToDownload": "5000000",
+                },
+                None,
+            ),
+            # Manifests with an invalid app id are skipped.
+            ({"appid": "0", "name": "Invalid", "StateFlags": "256"}, None),
+        ],
+        ids=["active", "paused", "completed_download", "zero_app_id"],
+    )
+    def test_find_active_game_fallback(
+        self, temp_steamapps, mock_parser, cached_acf, acf, expect_app_id
+    ):
+        """Test the ACF fallback when logs don't name an active download."""
+        acf_file = temp_steamapps / f"appmanifest_{acf['appid']}.acf"
+        cached_acf(acf_file)
+        mock_parser.parse_acf_ret = acf
 
         finder = GameFinder(temp_steamapps, mock_parser)
         game = finder.find_active_game()
 
-        assert game is not None
-        assert game.app_id == 12345
+        if expect_app_id is None:
+            assert game is None
+        else:
+            assert game is not None
+            assert game.app_id == expect_app_id
 
     def test_find_active_game_no_games(self, temp_steamapps, mock_parser):
         """Test when no games are found."""
-        mock_parser.get_most_recent_active_download.return_value = None
+        mock_parser.get_most_recent_active_download_ret = None
 
         finder = GameFinder(temp_steamapps, mock_parser)
         game = finder.find_active_game()
 
         assert game is None
 
-    def test_find_active_game_multiple_active(self, temp_steamapps, mock_parser):
+    def test_find_active_game_multiple_active(
+        self, temp_steamapps, mock_parser, cached_acf
+    ):
         """Test finding most recent when multiple games are active."""
-        import time
-
         # Create multiple ACF files
         acf_file1 = temp_steamapps / "appmanifest_12345.acf"
-        acf_file1.write_text('"AppState" { }')
-
-        time.sleep(0.01)
-
+        cached_acf(acf_file1, private=True)
         acf_file2 = temp_steamapps / "appmanifest_67890.acf"
-        acf_file2.write_text('"AppState" { }')
+        cached_acf(acf_file2, private=True)
+        # Stamp distinct mtimes so the second manifest is the newest.
+        os.utime(acf_file1, (1000.0, 1000.0))
+        os.utime(acf_file2, (2000.0, 2000.0))
 
         # Mock parser to return different data for each file
         def parse_acf_side_effect(path):
@@ -140,9 +135,9 @@ class TestGameFinder:
                     "BytesToDownload": "8000000",
                 }
 
-        mock_parser.get_most_recent_active_download.return_value = None
-        mock_parser.parse_acf.side_effect = parse_acf_side_effect
-        mock_parser.get_recent_pause_info.return_value = None
+        mock_parser.get_most_recent_active_download_ret = None
+        mock_parser.parse_acf_side = parse_acf_side_effect
+        mock_parser.get_recent_pause_info_ret = None
 
         finder = GameFinder(temp_steamapps, mock_parser)
         game = finder.find_active_game()
@@ -158,8 +153,8 @@ class TestGameFinder:
         acf_file.write_text("invalid content")
 
         # Mock parser to raise exception
-        mock_parser.get_most_recent_active_download.return_value = None
-        mock_parser.parse_acf.side_effect = Exception("Parse error")
+        mock_parser.get_most_recent_active_download_ret = None
+        mock_parser.parse_acf_side = Exception("Parse error")
 
         finder = GameFinder(temp_steamapps, mock_parser)
         game = finder.find_active_game()
@@ -167,15 +162,15 @@ class TestGameFinder:
         assert game is None
         assert "Failed to parse ACF" in caplog.text
 
-    def test_find_active_game_recently_paused(self, temp_steamapps, mock_parser):
+    def test_find_active_game_recently_paused(
+        self, temp_steamapps, mock_parser, cached_acf
+    ):
         """Test detecting recently paused games."""
-        from datetime import datetime
-
         acf_file = temp_steamapps / "appmanifest_12345.acf"
-        acf_file.write_text('"AppState" { }')
+        cached_acf(acf_file)
 
-        mock_parser.get_most_recent_active_download.return_value = None
-        mock_parser.parse_acf.return_value = {
+        mock_parser.get_most_recent_active_download_ret = None
+        mock_parser.parse_acf_ret = {
             "appid": "12345",
             "name": "Test Game",
             "StateFlags": "4",  # Not paused by flags
@@ -183,7 +178,7 @@ class TestGameFinder:
             "BytesToDownload": "5000000",
         }
         # But recent pause in logs
-        mock_parser.get_recent_pause_info.return_value = (datetime.now(), "paused")
+        mock_parser.get_recent_pause_info_ret = (datetime.now(), "paused")
 
         finder = GameFinder(temp_steamapps, mock_parser)
         game = finder.find_active_game()
@@ -191,57 +186,19 @@ class TestGameFinder:
         assert game is not None
         assert game.app_id == 12345
 
-    def test_find_active_game_completed_download(self, temp_steamapps, mock_parser):
-        """Test skipping games where download is complete."""
-        acf_file = temp_steamapps / "appmanifest_12345.acf"
-        acf_file.write_text('"AppState" { }')
-
-        mock_parser.get_most_recent_active_download.return_value = None
-        mock_parser.parse_acf.return_value = {
-            "appid": "12345",
-            "name": "Test Game",
-            "StateFlags": "256",
-            "BytesDownloaded": "5000000",  # Same as BytesToDownload
-            "BytesToDownload": "5000000",
-        }
-        mock_parser.get_recent_pause_info.return_value = None
-
-        finder = GameFinder(temp_steamapps, mock_parser)
-        game = finder.find_active_game()
-
-        # Should not return completed game
-        assert game is None
-
-    def test_find_active_game_zero_app_id(self, temp_steamapps, mock_parser):
-        """Test skipping ACF files with invalid app_id."""
-        acf_file = temp_steamapps / "appmanifest_0.acf"
-        acf_file.write_text('"AppState" { }')
-
-        mock_parser.get_most_recent_active_download.return_value = None
-        mock_parser.parse_acf.return_value = {
-            "appid": "0",
-            "name": "Invalid",
-            "StateFlags": "256",
-        }
-
-        finder = GameFinder(temp_steamapps, mock_parser)
-        game = finder.find_active_game()
-
-        assert game is None
-
     def test_find_active_game_prefers_logs_over_fallback(
-        self, temp_steamapps, mock_parser
+        self, temp_steamapps, mock_parser, cached_acf
     ):
         """Test that log-based detection is preferred over fallback."""
         # Create two ACF files
         acf_file1 = temp_steamapps / "appmanifest_12345.acf"
-        acf_file1.write_text('"AppState" { }')
+        cached_acf(acf_file1)
 
         acf_file2 = temp_steamapps / "appmanifest_67890.acf"
-        acf_file2.write_text('"AppState" { }')
+        cached_acf(acf_file2)
 
         # Mock parser to return app_id from logs
-        mock_parser.get_most_recent_active_download.return_value = 67890
+        mock_parser.get_most_recent_active_download_ret = 67890
 
         def parse_acf_side_effect(path):
             if "12345" in str(path):
@@ -249,7 +206,7 @@ class TestGameFinder:
             else:
                 return {"appid": "67890", "name": "Game 2"}
 
-        mock_parser.parse_acf.side_effect = parse_acf_side_effect
+        mock_parser.parse_acf_side = parse_acf_side_effect
 
         finder = GameFinder(temp_steamapps, mock_parser)
         game = finder.find_active_game()
@@ -257,3 +214,44 @@ class TestGameFinder:
         # Should return the one from logs (67890), not fallback
         assert game is not None
         assert game.app_id == 67890
+
+    def test_find_active_game_missing_steamapps(self, tmp_path, mock_parser, caplog):
+        """Test that a missing steamapps directory is logged, not raised."""
+        finder = GameFinder(tmp_path / "missing", mock_parser)
+        game = finder.find_active_game()
+
+        assert game is None
+        assert "Failed to scan" in caplog.text
+
+    def test_find_active_game_from_logs_reads_only_named_manifest(
+        self, temp_steamapps, mock_parser, cached_acf
+    ):
+        """Test that the manifest named after the logged app id is parsed alone."""
+        for app_id in (12345, 67890):
+            cached_acf(temp_steamapps / f"appmanifest_{app_id}.acf")
+
+        mock_parser.get_most_recent_active_download_ret = 67890
+        mock_parser.parse_acf_ret = {"appid": "67890", "name": "Game 2"}
+
+        finder = GameFinder(temp_steamapps, mock_parser)
+        game = finder.find_active_game()
+
+        assert game is not None
+        assert game.app_id == 67890
+        assert mock_parser.parsed == [temp_steamapps / "appmanifest_67890.acf"]
+
+    def test_find_active_game_from_logs_unexpected_manifest_name(
+        self, temp_steamapps, mock_parser, cached_acf
+    ):
+        """Test that manifests are scanned when none is named after the app id."""
+        acf_file = temp_steamapps / "appmanifest_renamed.acf"
+        cached_acf(acf_file)
+
+        mock_parser.get_most_recent_active_download_ret = 12345
+        mock_parser.parse_acf_ret = {"appid": "12345", "name": "Test Game"}
+
+        finder = GameFinder(temp_steamapps, mock_parser)
+        game = finder.find_active_game()
+
+        assert game is not None
+        assert game.path == acf_file
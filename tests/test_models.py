@@ -89,6 +89,13 @@ class TestThroughput:
         throughput = Throughput(bytes_per_sec=1000)
         with pytest.raises(AttributeError):
             throughput.bytes_per_sec = 2000
+        with pytest.raises(AttributeError):
+            throughput.mbps = 1.0
+
+    def test_equality_ignores_derived_fields(self):
+        """Test that equality and repr depend only on bytes_per_sec."""
+        assert Throughput(bytes_per_sec=1000) == Throughput(bytes_per_sec=1000)
+        assert repr(Throughput(bytes_per_sec=1000)) == "Throughput(bytes_per_sec=1000)"
 
 
 class TestDownloadState:
@@ -144,3 +151,23 @@ class TestDownloadSample:
         # Should be able to modify
         sample.speed_bytes_per_sec = 2000000
         assert sample.speed_bytes_per_sec == 2000000
+
+
+class TestSlots:
+    """Tests that per-sample models use __slots__ instead of a __dict__."""
+
+    @pytest.mark.parametrize(
+        "instance",
+        [
+            SteamInstall(root=Path("/s"), steamapps=Path("/s/a"), logs=Path("/s/l")),
+            DownloadingGame(app_id=1, name="Test Game", path=Path("/test")),
+            Throughput(bytes_per_sec=1000),
+            DownloadSample(timestamp=0.0, speed_bytes_per_sec=0.0, status="idle"),
+        ],
+        ids=lambda instance: type(instance).__name__,
+    )
+    def test_no_instance_dict(self, instance):
+        """Test that instances carry no per-instance __dict__."""
+        assert not hasattr(instance, "__dict__")
+        with pytest.raises((AttributeError, TypeError)):
+            instance.unexpected = 1
@@ -1,9 +1,17 @@
+import time
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
-from steam_monitor.monitor import SteamMonitor, LogHandler
+from unittest.mock import MagicMock
+from watchdog.events import DirModifiedEvent, FileModifiedEvent
+from watchdog.observers.polling import PollingObserver
+from steam_monitor.monitor import (
+    POLL_INTERVAL_SEC,
+    LogHandler,
+    SteamMonitor,
+    _make_observer_factory,
+)
 from steam_monitor.models import (
-    SteamInstall,
+    DownloadSample,
     DownloadingGame,
     DownloadState,
     Throughput,
@@ -20,8 +28,8 @@ class TestLogHandler:
         handler = LogHandler(mock_parser)
         assert handler.log_parser == mock_parser
 
-    def test_on_modified_updates_log_state(self):
-        """Test that on_modified calls _update_log_state."""
+    def test_on_modified_marks_dirty(self):
+        """Test that on_modified only marks the log dirty."""
         mock_parser = MagicMock()
         mock_parser.log_file = Path("/tmp/content_log.txt")
         handler = LogHandler(mock_parser)
@@ -32,7 +40,8 @@ class TestLogHandler:
 
         handler.on_modified(event)
 
-        mock_parser._update_log_state.assert_called_once()
+        assert handler.dirty.is_set()
+        mock_parser._update_log_state.assert_not_called()
 
     def test_on_modified_ignores_other_files(self):
         """Test that on_modified ignores events for other files."""
@@ -45,11 +54,43 @@ class TestLogHandler:
         event.src_path = "/tmp/other_file.txt"
 
         handler.on_modified(event)
+        handler.flush()
 
+        assert not handler.dirty.is_set()
         mock_parser._update_log_state.assert_not_called()
 
-    def test_on_modified_handles_exceptions(self, caplog):
-        """Test that on_modified handles exceptions gracefully."""
+    def test_dispatch_filters_by_path(self):
+        """Test that dispatch drops events for other files and directories."""
+        mock_parser = MagicMock()
+        mock_parser.log_file = Path("/tmp/content_log.txt")
+        handler = LogHandler(mock_parser)
+
+        handler.dispatch(FileModifiedEvent("/tmp/other_file.txt"))
+        handler.dispatch(DirModifiedEvent("/tmp"))
+        assert not handler.dirty.is_set()
+
+        handler.dispatch(FileModifiedEvent(str(mock_parser.log_file)))
+        assert handler.dirty.is_set()
+
+    def test_flush_coalesces_events(self):
+        """Test that several modify events lead to a single update."""
+        mock_parser = MagicMock()
+        mock_parser.log_file = Path("/tmp/content_log.txt")
+        handler = LogHandler(mock_parser)
+
+        event = MagicMock()
+        event.src_path = str(mock_parser.log_file)
+
+        for _ in range(5):
+            handler.on_modified(event)
+        handler.flush()
+        handler.flush()
+
+        mock_parser._update_log_state.assert_called_once()
+        assert not handler.dirty.is_set()
+
+    def test_flush_handles_exceptions(self, caplog):
+        """Test that flush handles update exceptions gracefully."""
         mock_parser = MagicMock()
         mock_parser.log_file = Path("/tmp/content_log.txt")
         mock_parser._update_log_state.side_effect = Exception("Update failed")
@@ -60,44 +101,15 @@ class TestLogHandler:
 
         # Should not raise
         handler.on_modified(event)
+        handler.flush()
 
         assert "Error updating log state" in caplog.text
 
 
+@pytest.mark.usefixtures("mock_observer")
 class TestSteamMonitor:
     """Tests for SteamMonitor class."""
 
-    @pytest.fixture
-    def mock_steam_install(self):
-        """Create a mock SteamInstall."""
-        return SteamInstall(
-            root=Path("/steam"),
-            steamapps=Path("/steam/steamapps"),
-            logs=Path("/steam/logs"),
-        )
-
-    @pytest.fixture
-    def mock_parser(self):
-        """Create a mock LogParser."""
-        parser = MagicMock()
-        parser.log_file = Path("/steam/logs/content_log.txt")
-        parser.read_latest_speed.return_value = None
-        parser.parse_acf.return_value = {
-            "appid": "12345",
-            "name": "Test Game",
-            "StateFlags": "256",
-        }
-        parser.get_status.return_value = DownloadState.DOWNLOADING
-        return parser
-
-    @pytest.fixture
-    def mock_game_finder(self):
-        """Create a mock GameFinder."""
-        finder = MagicMock()
-        finder.find_active_game.return_value = None
-        return finder
-
-    @patch("steam_monitor.monitor.Observer")
     def test_initialization(
         self, mock_observer, mock_steam_install, mock_parser, mock_game_finder
     ):
@@ -111,7 +123,6 @@ class TestSteamMonitor:
         # Observer should NOT be started in __init__ - only in __enter__
         mock_observer.return_value.start.assert_not_called()
 
-    @patch("steam_monitor.monitor.Observer")
     def test_cleanup(
         self, mock_observer, mock_steam_install, mock_parser, mock_game_finder
     ):
@@ -125,14 +136,52 @@ class TestSteamMonitor:
 
         mock_obs.stop.assert_called_once()
         mock_obs.join.assert_called_once()
+        assert not monitor._update_thread.is_alive()
+
+    def test_update_thread_applies_pending_changes(
+        self, mock_steam_install, mock_parser, mock_game_finder
+    ):
+        """Test that the update thread tails the log after a modify event."""
+        monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
+        event = MagicMock()
+        event.src_path = str(mock_parser.log_file)
+
+        with monitor:
+            monitor.log_handler.on_modified(event)
+            deadline = time.monotonic() + 2.0
+            while not mock_parser.updates and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert mock_parser.updates == 1
+
+    def test_update_thread_waits_for_quiet(
+        self,
+        mock_steam_install,
+        mock_parser,
+        mock_game_finder,
+        monkeypatch,
+    ):
+        """Test that a burst of modify events is tailed once after it ends."""
+        monkeypatch.setattr("steam_monitor.monitor.UPDATE_COALESCE_SEC", 0.2)
+        monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
+        event = MagicMock()
+        event.src_path = str(mock_parser.log_file)
+
+        with monitor:
+            for _ in range(10):
+                monitor.log_handler.on_modified(event)
+                time.sleep(0.03)
+            assert mock_parser.updates == 0
+            deadline = time.monotonic() + 2.0
+            while not mock_parser.updates and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert mock_parser.updates == 1
 
-    @patch("steam_monitor.monitor.Observer")
     def test_get_current_sample_no_active_game(
-        self, mock_observer, mock_steam_install, mock_parser, mock_game_finder
+        self, mock_steam_install, mock_parser, mock_game_finder
     ):
         """Test getting sample when no game is active."""
-        mock_game_finder.find_active_game.return_value = None
-
         monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
         sample = monitor.get_current_sample()
 
@@ -140,12 +189,8 @@ class TestSteamMonitor:
         assert sample.status == DownloadState.IDLE.value
         assert sample.game is None
 
-    @patch("steam_monitor.monitor.Observer")
-    @patch("time.time", return_value=1234567890.0)
     def test_get_current_sample_with_game_downloading(
         self,
-        mock_time,
-        mock_observer,
         mock_steam_install,
         mock_parser,
         mock_game_finder,
@@ -156,18 +201,23 @@ class TestSteamMonitor:
             name="Test Game",
             path=Path("/steam/steamapps/appmanifest_12345.acf"),
         )
-        mock_game_finder.find_active_game.return_value = game
+        mock_game_finder.find_active_game_ret = game
 
-        mock_parser.read_latest_speed.return_value = (
+        mock_parser.read_latest_speed_ret = (
             datetime.now(),
             Throughput(bytes_per_sec=10_000_000.0),
         )
-        mock_parser.parse_acf.return_value = {
+        mock_parser.parse_acf_ret = {
             "StateFlags": "256",
         }
-        mock_parser.get_status.return_value = DownloadState.DOWNLOADING
+        mock_parser.get_status_ret = DownloadState.DOWNLOADING
 
-        monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
+        monitor = SteamMonitor(
+            mock_steam_install,
+            mock_parser,
+            mock_game_finder,
+            clock=lambda: 1234567890.0,
+        )
         sample = monitor.get_current_sample()
 
         assert sample.timestamp == 1234567890.0
@@ -175,9 +225,8 @@ class TestSteamMonitor:
         assert sample.status == DownloadState.DOWNLOADING.value
         assert sample.game == game
 
-    @patch("steam_monitor.monitor.Observer")
     def test_get_current_sample_with_game_paused(
-        self, mock_observer, mock_steam_install, mock_parser, mock_game_finder
+        self, mock_steam_install, mock_parser, mock_game_finder
     ):
         """Test getting sample when game is paused."""
         game = DownloadingGame(
@@ -185,13 +234,13 @@ class TestSteamMonitor:
             name="Test Game",
             path=Path("/steam/steamapps/appmanifest_12345.acf"),
         )
-        mock_game_finder.find_active_game.return_value = game
+        mock_game_finder.find_active_game_ret = game
 
-        mock_parser.read_latest_speed.return_value = None
-        mock_parser.parse_acf.return_value = {
+        mock_parser.read_latest_speed_ret = None
+        mock_parser.parse_acf_ret = {
             "StateFlags": "512",
         }
-        mock_parser.get_status.return_value = DownloadState.PAUSED
+        mock_parser.get_status_ret = DownloadState.PAUSED
 
         monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
         sample = monitor.get_current_sample()
@@ -199,9 +248,8 @@ class TestSteamMonitor:
         assert sample.speed_bytes_per_sec == 0.0
         assert sample.status == DownloadState.PAUSED.value
 
-    @patch("steam_monitor.monitor.Observer")
     def test_get_current_sample_speed_zero_when_not_downloading(
-        self, mock_observer, mock_steam_install, mock_parser, mock_game_finder
+        self, mock_steam_install, mock_parser, mock_game_finder
     ):
         """Test that speed is set to 0 when status is not downloading."""
         game = DownloadingGame(
@@ -209,16 +257,16 @@ class TestSteamMonitor:
             name="Test Game",
             path=Path("/steam/steamapps/appmanifest_12345.acf"),
         )
-        mock_game_finder.find_active_game.return_value = game
+        mock_game_finder.find_active_game_ret = game
 
         # Clear any existing speed cache
-        mock_parser.read_latest_speed.return_value = None
+        mock_parser.read_latest_speed_ret = None
 
-        mock_parser.parse_acf.return_value = {
+        mock_parser.parse_acf_ret = {
             "BytesDownloaded": "5000000",
             "StateFlags": "512",  # PAUSED state
         }
-        mock_parser.get_status.return_value = DownloadState.PAUSED
+        mock_parser.get_status_ret = DownloadState.PAUSED
 
         monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
         sample = monitor.get_current_sample()
@@ -226,9 +274,41 @@ class TestSteamMonitor:
         # Speed should be 0 since no recent speed entry and status is paused
         assert sample.speed_bytes_per_sec == 0.0
 
-    @patch("steam_monitor.monitor.Observer")
+    def test_get_current_sample_uses_one_snapshot(
+        self, mock_steam_install, mock_parser, mock_game_finder
+    ):
+        """Test that every log query in a sample reads the same snapshot."""
+        game = DownloadingGame(
+            app_id=12345,
+            name="Test Game",
+            path=Path("/steam/steamapps/appmanifest_12345.acf"),
+        )
+        mock_game_finder.find_active_game_ret = game
+        snapshot = mock_parser.snapshot_ret
+
+        monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
+        monitor.get_current_sample()
+
+        assert mock_parser.snapshots_taken == 1
+        assert mock_game_finder.queried_with == [snapshot]
+        assert mock_parser.queried_with == [snapshot, snapshot]
+
+    def test_get_current_sample_fills_given_sample(
+        self, mock_steam_install, mock_parser, mock_game_finder
+    ):
+        """Test that a passed-in sample is overwritten and returned."""
+        out = DownloadSample(1.0, 2.0, DownloadState.DOWNLOADING.value, object())
+
+        monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
+        sample = monitor.get_current_sample(out)
+
+        assert sample is out
+        assert sample.speed_bytes_per_sec == 0.0
+        assert sample.status == DownloadState.IDLE.value
+        assert sample.game is None
+
     def test_get_current_sample_acf_parse_error(
-        self, mock_observer, mock_steam_install, mock_parser, mock_game_finder, caplog
+        self, mock_steam_install, mock_parser, mock_game_finder, caplog
     ):
         """Test handling of ACF parse errors."""
         game = DownloadingGame(
@@ -236,11 +316,27 @@ class TestSteamMonitor:
             name="Test Game",
             path=Path("/steam/steamapps/appmanifest_12345.acf"),
         )
-        mock_game_finder.find_active_game.return_value = game
-        mock_parser.parse_acf.side_effect = Exception("Parse error")
+        mock_game_finder.find_active_game_ret = game
+        mock_parser.parse_acf_side = Exception("Parse error")
 
         monitor = SteamMonitor(mock_steam_install, mock_parser, mock_game_finder)
         sample = monitor.get_current_sample()
 
         assert sample.status == DownloadState.IDLE.value
         assert "Error processing sample" in caplog.text
+
+
+class TestObserverFallback:
+    """Tests for the observer chosen when watchdog has no native backend."""
+
+    def test_polling_fallback_uses_poll_interval(self):
+        """Test that the polling fallback polls every POLL_INTERVAL_SEC."""
+        observer = _make_observer_factory(PollingObserver)()
+
+        assert isinstance(observer, PollingObserver)
+        assert observer.timeout == POLL_INTERVAL_SEC
+
+    def test_native_observer_is_kept(self):
+        """Test that a native observer class is used unchanged."""
+        native = object()
+        assert _make_observer_factory(native) is native
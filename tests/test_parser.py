@@ -1,5 +1,7 @@
+import os
 import pytest
 from datetime import datetime, timedelta
+from unittest.mock import patch
 from steam_monitor.errors import ACFParseError
 from steam_monitor.parser import LogParser
 from steam_monitor.models import Throughput, DownloadState
@@ -56,56 +58,61 @@ class TestLogParser:
         assert data["BytesDownloaded"] == "1000000"
         assert data["BytesToDownload"] == "5000000"
 
-    def test_parse_acf_missing_file(self, temp_logs_dir, tmp_path):
-        """Test parsing a non-existent ACF file."""
-        parser = LogParser(temp_logs_dir)
-        acf_file = tmp_path / "nonexistent.acf"
+    def test_parse_acf_decodes_utf8_values(self, temp_logs_dir, tmp_path):
+        """Test that UTF-8 values survive and invalid bytes are dropped."""
+        acf_file = tmp_path / "appmanifest_12345.acf"
+        acf_file.write_bytes(
+            '"AppState"\n{\n\t"name"\t"Игра"\n'.encode()
+            + b'\t"appid"\t"123\xff45"\n}\n'
+        )
 
-        with pytest.raises(ACFParseError):
-            parser.parse_acf(acf_file)
+        parser = LogParser(temp_logs_dir)
+        data = parser.parse_acf(acf_file)
 
-    def test_read_latest_speed_from_kb_s(self, log_file, temp_logs_dir):
-        """Test reading speed in KB/s format."""
-        now = datetime.now()
-        log_content = f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] Download rate: 1024.5 KB/s AppID 12345\n"
-        log_file.write_text(log_content)
+        assert data == {"name": "Игра", "appid": "12345"}
 
+    def test_parse_acf_result_is_read_only(self, temp_logs_dir, tmp_path):
+        """Test that callers cannot corrupt the cached ACF result."""
+        acf_file = tmp_path / "appmanifest_12345.acf"
+        acf_file.write_text('"AppState"\n{\n\t"appid"\t"12345"\n}\n')
         parser = LogParser(temp_logs_dir)
-        result = parser.read_latest_speed()
-
-        assert result is not None
-        timestamp, throughput = result
-        assert isinstance(throughput, Throughput)
-        # 1024.5 KB/s = 1024.5 * 1024 bytes/s
-        assert abs(throughput.bytes_per_sec - (1024.5 * 1024)) < 1
 
-    def test_read_latest_speed_from_mb_s(self, log_file, temp_logs_dir):
-        """Test reading speed in MB/s format."""
-        now = datetime.now()
-        log_content = f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] Download rate: 10.5 MB/s AppID 12345\n"
-        log_file.write_text(log_content)
+        with pytest.raises(TypeError):
+            parser.parse_acf(acf_file)["appid"] = "0"
+        assert parser.parse_acf(acf_file)["appid"] == "12345"
 
+    def test_parse_acf_missing_file(self, temp_logs_dir, tmp_path):
+        """Test parsing a non-existent ACF file."""
         parser = LogParser(temp_logs_dir)
-        result = parser.read_latest_speed()
+        acf_file = tmp_path / "nonexistent.acf"
 
-        assert result is not None
-        timestamp, throughput = result
-        # 10.5 MB/s = 10.5 * 1024 * 1024 bytes/s
-        assert abs(throughput.bytes_per_sec - (10.5 * 1024 * 1024)) < 1
+        with pytest.raises(ACFParseError):
+            parser.parse_acf(acf_file)
 
-    def test_read_latest_speed_from_mbps(self, log_file, temp_logs_dir):
-        """Test reading speed in Mbps format."""
+    @pytest.mark.parametrize(
+        "rate,expected_bps",
+        [
+            ("1024.5 KB/s", 1024.5 * 1024),
+            ("10.5 MB/s", 10.5 * 1024 * 1024),
+            ("100.0 Mbps", 100 * 1_000_000 / 8),
+        ],
+        ids=["kb_s", "mb_s", "mbps"],
+    )
+    def test_read_latest_speed_units(self, log_file, temp_logs_dir, rate, expected_bps):
+        """Test reading speed in each supported unit."""
         now = datetime.now()
-        log_content = f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] Download rate: 100.0 Mbps AppID 12345\n"
-        log_file.write_text(log_content)
+        log_file.write_text(
+            f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] Download rate: {rate} AppID 12345\n"
+        )
 
         parser = LogParser(temp_logs_dir)
         result = parser.read_latest_speed()
 
         assert result is not None
         timestamp, throughput = result
-        # 100 Mbps = 100 * 1_000_000 / 8 bytes/s
-        assert abs(throughput.bytes_per_sec - (100 * 1_000_000 / 8)) < 1
+        assert isinstance(throughput, Throughput)
+        assert timestamp == now.replace(microsecond=0)
+        assert abs(throughput.bytes_per_sec - expected_bps) < 1
 
     def test_read_latest_speed_old_entry(self, log_file, temp_logs_dir):
         """Test that old speed entries are ignored."""
@@ -138,6 +145,36 @@ class TestLogParser:
         assert mapping["12346"] == "12345"
         assert mapping["12347"] == "12345"
 
+    def test_build_depot_app_mapping_is_read_only_copy(self, log_file, temp_logs_dir):
+        """Test that the mapping is a frozen copy callers cannot modify."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write_text(
+            f"[{now}] Downloading 50 chunks from depot 12346 AppID 12345\n"
+        )
+
+        parser = LogParser(temp_logs_dir)
+        mapping = parser.build_depot_app_mapping()
+
+        with pytest.raises(TypeError):
+            mapping["1"] = "2"
+        log_file.write_text(f"[{now}] Downloading 5 chunks from depot 2 AppID 1\n")
+        parser._update_log_state()
+        assert mapping == {"12346": "12345"}
+        assert parser.build_depot_app_mapping() == {"2": "1"}
+
+    def test_only_rate_lines_ignore_case(self, log_file, temp_logs_dir):
+        """Test that rate lines match in any case but event keywords do not."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write_text(
+            f"[{now}] download RATE: 1.0 mb/s AppID 12345\n"
+            f"[{now}] AppID 7 Update Started\n"
+        )
+
+        parser = LogParser(temp_logs_dir)
+
+        assert parser.read_latest_speed()[1].bytes_per_sec == 1024 * 1024
+        assert 7 not in parser.recent_events
+
     def test_get_recent_pause_info_paused(self, log_file, temp_logs_dir):
         """Test detecting recent pause event."""
         now = datetime.now()
@@ -254,6 +291,27 @@ class TestLogParser:
 
         assert result is None
 
+    def test_get_most_recent_active_download_skips_repeated_paused_rates(
+        self, log_file, temp_logs_dir
+    ):
+        """Test that repeated rates of a paused app fall through to an older app."""
+        now = datetime.now()
+
+        def line(seconds_ago, text):
+            ts = (now - timedelta(seconds=seconds_ago)).strftime("%Y-%m-%d %H:%M:%S")
+            return f"[{ts}] {text}\n"
+
+        log_file.write_text(
+            line(50, "Download rate: 1.0 MB/s AppID 111")
+            + line(40, "Download rate: 2.0 MB/s AppID 222")
+            + line(30, "Download rate: 2.0 MB/s AppID 222")
+            + line(20, "AppID 222 update canceled")
+        )
+
+        parser = LogParser(temp_logs_dir)
+
+        assert parser.get_most_recent_active_download() == 111
+
     def test_log_file_truncation(self, log_file, temp_logs_dir):
         """Test handling of log file truncation."""
         now = datetime.now()
@@ -277,3 +335,213 @@ class TestLogParser:
         # Parser interprets "MB/s" as MiB/s (1024-based), so 3.0 MB/s = 3.0 * 1024 * 1024 bytes/s
         expected_mb = 3.0
         assert abs(result[1].bytes_per_sec - (expected_mb * 1024 * 1024)) < 1000
+
+    def test_depot_line_maps_depot_and_starts_download(self, log_file, temp_logs_dir):
+        """Test that a depot chunk line feeds both the depot map and start events."""
+        now = datetime.now()
+        log_content = (
+            f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] Downloading 50 chunks "
+            "from depot 12346 AppID 12345\n"
+            "malformed line without timestamp AppID 99999 update started\n"
+        )
+        log_file.write_text(log_content)
+
+        parser = LogParser(temp_logs_dir)
+
+        assert parser.build_depot_app_mapping() == {"12346": "12345"}
+        assert parser.get_most_recent_active_download() == 12345
+        assert 99999 not in parser.recent_events
+
+    def test_parse_acf_cached_until_mtime_changes(self, temp_logs_dir, tmp_path):
+        """Test that ACF results are reused until the file's mtime changes."""
+        acf_file = tmp_path / "appmanifest_12345.acf"
+        acf_file.write_text('"AppState" { "name" "Old Name" }')
+        os.utime(acf_file, (1000.0, 1000.0))
+
+        parser = LogParser(temp_logs_dir)
+        assert parser.parse_acf(acf_file)["name"] == "Old Name"
+
+        with patch.object(parser, "_parse_acf_file") as mock_parse:
+            assert parser.parse_acf(acf_file)["name"] == "Old Name"
+            mock_parse.assert_not_called()
+
+        acf_file.write_text('"AppState" { "name" "New Name" }')
+        os.utime(acf_file, (2000.0, 2000.0))
+        assert parser.parse_acf(acf_file)["name"] == "New Name"
+
+    def test_parse_acf_cache_evicts_least_recently_used(self, temp_logs_dir, tmp_path):
+        """Test that a full ACF cache drops the entry used longest ago."""
+        files = []
+        for app_id in (1, 2, 3):
+            acf_file = tmp_path / f"appmanifest_{app_id}.acf"
+            acf_file.write_text(f'"AppState" {{ "appid" "{app_id}" }}')
+            files.append(acf_file)
+
+        parser = LogParser(temp_logs_dir)
+        with patch("steam_monitor.parser.ACF_CACHE_SIZE", 2):
+            parser.parse_acf(files[0])
+            parser.parse_acf(files[1])
+            parser.parse_acf(files[0])
+            parser.parse_acf(files[2])
+
+        assert list(parser._acf_cache) == [files[0], files[2]]
+
+    def test_parse_acf_nested_sections(self, temp_logs_dir, tmp_path):
+        """Test that section names are skipped and nested pairs are flattened."""
+        acf_file = tmp_path / "appmanifest_12345.acf"
+        acf_file.write_text(
+            '"AppState"\n{\n\t"appid"\t\t"12345"\n\t"InstalledDepots"\n\t{\n'
+            '\t\t"12346"\n\t\t{\n\t\t\t"manifest"\t\t"987"\n\t\t}\n\t}\n'
+            '\t"name"\t\t"Test Game"\n}\n'
+        )
+
+        parser = LogParser(temp_logs_dir)
+        data = parser.parse_acf(acf_file)
+
+        assert data == {"appid": "12345", "manifest": "987", "name": "Test Game"}
+
+    def test_queries_debounce_log_reads(self, log_file, temp_logs_dir):
+        """Test that back-to-back queries reuse state read moments ago."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write_text(f"[{now}] Download rate: 5.0 MB/s AppID 12345\n")
+        parser = LogParser(temp_logs_dir)
+
+        with log_file.open("a") as f:
+            f.write(f"[{now}] Download rate: 3.0 MB/s AppID 12345\n")
+
+        with patch.object(parser, "_update_log_state") as mock_update:
+            parser.read_latest_speed()
+            parser.get_most_recent_active_download()
+            mock_update.assert_not_called()
+
+        parser._update_log_state()
+        assert parser.rate_entries[-1][2] == "3.0"
+
+    def test_partial_line_read_once_complete(self, log_file, temp_logs_dir):
+        """Test that a line still being written is parsed once it is complete."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write_bytes(f"[{now}] Download rate: 2.0 MB/s AppID 1".encode())
+
+        parser = LogParser(temp_logs_dir)
+        assert parser.last_pos == 0
+        assert parser.latest_rate is None
+
+        with log_file.open("ab") as f:
+            f.write(b"2345\n")
+        parser._update_log_state()
+
+        assert parser.last_pos == log_file.stat().st_size
+        assert parser.get_most_recent_active_download() == 12345
+
+    def test_get_most_recent_active_download_skips_paused_app(
+        self, log_file, temp_logs_dir
+    ):
+        """Test that an older rate for another app wins over a paused newer one."""
+        now = datetime.now()
+
+        def ts(seconds_ago):
+            return (now - timedelta(seconds=seconds_ago)).strftime("%Y-%m-%d %H:%M:%S")
+
+        log_file.write_text(
+            f"[{ts(40)}] Download rate: 4.0 MB/s AppID 11111\n"
+            f"[{ts(30)}] Download rate: 10.0 MB/s AppID 22222\n"
+            f"[{ts(10)}] AppID 22222 update canceled\n"
+        )
+
+        parser = LogParser(temp_logs_dir)
+
+        assert parser.get_most_recent_active_download() == 11111
+
+    def test_out_of_range_timestamp_is_skipped(self, log_file, temp_logs_dir):
+        """Test that lines with impossible timestamps are ignored."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write_text(
+            "[2024-13-45 99:00:00] Download rate: 9.0 MB/s AppID 99999\n"
+            f"[{now}] Download rate: 1.0 MB/s AppID 12345\n"
+        )
+
+        parser = LogParser(temp_logs_dir)
+
+        assert parser.get_most_recent_active_download() == 12345
+        assert [entry[1] for entry in parser.rate_entries] == [12345]
+
+    def test_rate_line_attributed_through_depot(self, log_file, temp_logs_dir):
+        """Test that a rate line naming only a depot is attributed to its app."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write_text(
+            f"[{now}] Downloading 50 chunks from depot 12346 AppID 12345\n"
+            f"[{now}] Download rate: 7.5 MB/s depot 12346\n"
+            f"[{now}] Download rate: 1.0 MB/s depot 55555\n"
+        )
+
+        parser = LogParser(temp_logs_dir)
+
+        assert list(parser.rate_entries) == [(parser.rate_entries[0][0], 12345, "7.5")]
+
+    def test_event_patterns_do_not_span_lines(self, log_file, temp_logs_dir):
+        """Test that an event keyword on the next line is not attributed."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write_text(
+            f"[{now}] AppID 12345 state changed\n"
+            "update started\n"
+            f"[{now}] AppID 67890 Created download interface\n"
+        )
+
+        parser = LogParser(temp_logs_dir)
+
+        assert 12345 not in parser.recent_events
+        assert list(parser.recent_events[67890])[0][1] == "network"
+
+    def test_full_load_reads_only_log_tail(self, log_file, temp_logs_dir):
+        """Test that the initial load skips everything before the log tail."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        head = f"[{now}] Download rate: 9.0 MB/s AppID 99999\n"
+        tail = f"[{now}] Download rate: 1.0 MB/s AppID 12345\n"
+        log_file.write_text(head + tail)
+
+        with patch("steam_monitor.parser.FULL_LOAD_TAIL_BYTES", len(tail) + 5):
+            parser = LogParser(temp_logs_dir)
+
+        assert [entry[1] for entry in parser.rate_entries] == [12345]
+        assert parser.last_pos == log_file.stat().st_size
+
+    def test_snapshot_is_frozen(self, log_file, temp_logs_dir):
+        """Test that queries against a snapshot ignore later log lines."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write_text(f"[{now}] Download rate: 2.0 MB/s AppID 12345\n")
+        parser = LogParser(temp_logs_dir)
+        snapshot = parser.snapshot()
+
+        with open(log_file, "a") as f:
+            f.write(f"[{now}] AppID 12345 update canceled\n")
+        parser._update_log_state()
+
+        assert parser.get_recent_pause_info(12345) is not None
+        assert parser.get_recent_pause_info(12345, snapshot) is None
+        assert parser.get_most_recent_active_download(snapshot) == 12345
+        assert parser.read_latest_speed(snapshot)[1].bytes_per_sec == 2 * 1024 * 1024
+        assert list(snapshot.recent_events) == []
+
+    def test_snapshot_clock_is_whole_seconds(self, log_file, temp_logs_dir):
+        """Test that the snapshot clock is an int, like parsed log timestamps."""
+        now = datetime.now()
+        log_file.write_text(
+            f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] Download rate: 2.0 MB/s AppID 1\n"
+        )
+        snapshot = LogParser(temp_logs_dir).snapshot()
+
+        assert type(snapshot.now) is int
+        assert 0 <= snapshot.now - snapshot.latest_rate[0] <= 2
+
+    def test_tail_without_pread(self, log_file, temp_logs_dir):
+        """Test that tailing works where os.pread is unavailable."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write_text(f"[{now}] Download rate: 1.0 MB/s AppID 11111\n")
+
+        with patch("steam_monitor.parser._HAS_PREAD", False):
+            parser = LogParser(temp_logs_dir)
+            with open(log_file, "a") as f:
+                f.write(f"[{now}] Download rate: 2.0 MB/s AppID 22222\n")
+            parser._update_log_state()
+
+        assert [entry[1] for entry in parser.rate_entries] == [11111, 22222]